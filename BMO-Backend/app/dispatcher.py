@@ -0,0 +1,286 @@
+"""
+Front dispatcher for running BMO on several worker processes.
+
+Each worker is a normal `app.main:app` uvicorn process on a local port with
+its own Llama instance. The GGUF file is opened with use_mmap=True and no
+mlock, so the weights live once in the OS page cache and every worker maps
+the same read-only pages; what each worker adds is its KV cache and scratch
+buffers. Chat is pinned per session: the dispatcher hashes the session id to
+a worker, so a conversation's memory (and llama.cpp's evaluated prompt
+prefix) always stays in the same process.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger("BMO-Dispatcher")
+
+SESSION_HEADER = "X-BMO-Session"
+WORKER_HEADER = "X-BMO-Worker"
+# Headers that describe one hop, not the message, and must not be forwarded
+HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length",
+}
+WATCH_INTERVAL = 2.0
+RESTART_BACKOFF = 5.0
+
+
+class Worker:
+    """One uvicorn process serving BMO on a local port"""
+
+    def __init__(self, index: int, port: int, threads: int):
+        self.index = index
+        self.port = port
+        self.threads = threads
+        self.url = f"http://127.0.0.1:{port}"
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at: Optional[float] = None
+        self.restarts = 0
+        self.requests = 0
+
+    def start(self):
+        env = dict(os.environ, BMO_THREADS=str(self.threads), BMO_WORKER_INDEX=str(self.index))
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", "127.0.0.1",
+                "--port", str(self.port),
+                "--log-level", "info",
+            ],
+            env=env,
+        )
+        self.started_at = time.time()
+        logger.info(f"Worker {self.index} started on port {self.port} (pid {self.process.pid}, {self.threads} threads)")
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def signal(self, signum: int):
+        if self.alive():
+            self.process.send_signal(signum)
+
+    def stop(self, timeout: float = 10.0):
+        if not self.alive():
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "port": self.port,
+            "pid": self.process.pid if self.process else None,
+            "alive": self.alive(),
+            "threads": self.threads,
+            "restarts": self.restarts,
+            "requests": self.requests,
+        }
+
+
+class Dispatcher:
+    """Starts the workers, keeps them running, and routes requests to them"""
+
+    def __init__(self, workers: int, base_port: int, threads: Optional[int] = None):
+        if workers < 1:
+            raise ValueError("BMO needs at least one worker")
+        cores = os.cpu_count() or 1
+        threads = threads or max(1, cores // workers)
+        self.workers = [Worker(i, base_port + i, threads) for i in range(workers)]
+        self.client: Optional[httpx.AsyncClient] = None
+        self._watcher: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def worker_for(self, session_key: str) -> Worker:
+        """Stable session -> worker mapping, the same across dispatcher restarts"""
+        digest = hashlib.blake2b(session_key.encode(), digest_size=8).digest()
+        return self.workers[int.from_bytes(digest, "big") % len(self.workers)]
+
+    async def start(self):
+        # Long timeout: a worker's first request may wait for its model to load
+        self.client = httpx.AsyncClient(timeout=httpx.Timeout(600.0, connect=5.0))
+        for worker in self.workers:
+            worker.start()
+        self._watcher = asyncio.create_task(self._watch())
+        asyncio.create_task(self._warm_up())
+
+    async def stop(self):
+        self._stopping = True
+        if self._watcher is not None:
+            self._watcher.cancel()
+        for worker in self.workers:
+            worker.stop()
+        if self.client is not None:
+            await self.client.aclose()
+
+    async def _warm_up(self):
+        """Touch every worker so the models load now instead of on the first chat"""
+        for _ in range(60):
+            results = await self.broadcast("GET", "/chat/metrics")
+            if all("error" not in result for result in results):
+                logger.info(f"All {len(self.workers)} BMO workers are ready!")
+                return
+            await asyncio.sleep(1.0)
+        logger.warning("Some BMO workers are still not answering")
+
+    async def _watch(self):
+        """Restart workers that died, so their sessions' hash slot keeps being served"""
+        while not self._stopping:
+            await asyncio.sleep(WATCH_INTERVAL)
+            for worker in self.workers:
+                if worker.alive() or self._stopping:
+                    continue
+                if worker.started_at and time.time() - worker.started_at < RESTART_BACKOFF:
+                    continue
+                logger.error(f"Worker {worker.index} exited with code {worker.process.returncode}, restarting")
+                worker.restarts += 1
+                worker.start()
+
+    def signal_workers(self, signum: int):
+        for worker in self.workers:
+            worker.signal(signum)
+
+    async def forward(self, worker: Worker, request: Request, body: bytes) -> Response:
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_HEADERS}
+        worker.requests += 1
+        try:
+            upstream = await self.client.request(
+                request.method,
+                worker.url + request.url.path,
+                params=request.query_params,
+                content=body,
+                headers=headers,
+            )
+        except httpx.TransportError as e:
+            logger.error(f"Worker {worker.index} unreachable: {e}")
+            return JSONResponse(
+                status_code=503,
+                content={"detail": "BMO is still starting up! Please wait a moment and try again. *beep boop*"},
+                headers={WORKER_HEADER: str(worker.index)},
+            )
+        response_headers = {k: v for k, v in upstream.headers.items() if k.lower() not in HOP_HEADERS}
+        response_headers[WORKER_HEADER] = str(worker.index)
+        return Response(content=upstream.content, status_code=upstream.status_code, headers=response_headers)
+
+    async def broadcast(self, method: str, path: str, **kwargs) -> List[Dict[str, Any]]:
+        """Send the same request to every worker, returning each one's JSON (or error)"""
+        async def call(worker: Worker) -> Dict[str, Any]:
+            try:
+                response = await self.client.request(method, worker.url + path, **kwargs)
+                return {"worker": worker.index, "status_code": response.status_code, "body": response.json()}
+            except (httpx.HTTPError, ValueError) as e:
+                return {"worker": worker.index, "error": str(e)}
+
+        return list(await asyncio.gather(*(call(worker) for worker in self.workers)))
+
+
+def session_key(request: Request, body: bytes) -> str:
+    """The session a request belongs to: body session_id, query, header, then the client's address"""
+    if body and request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict) and payload.get("session_id"):
+            return str(payload["session_id"])
+    key = request.query_params.get("session_id") or request.headers.get(SESSION_HEADER)
+    if key:
+        return key
+    return request.client.host if request.client else "default"
+
+
+def create_app(workers: int, base_port: int, threads: Optional[int] = None) -> FastAPI:
+    """FastAPI app that fronts `workers` BMO processes on base_port, base_port + 1, ..."""
+    dispatcher = Dispatcher(workers, base_port, threads)
+    app = FastAPI(
+        title="BMO Local Chat API (dispatcher)",
+        version="1.0.0",
+        description=f"Routes BMO chat sessions to {workers} worker processes"
+    )
+    app.state.dispatcher = dispatcher
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, specify your frontend URL
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    @app.on_event("startup")
+    async def start_workers():
+        await dispatcher.start()
+        if hasattr(signal, "SIGHUP"):
+            # Same hot reload as a single server, done by every worker
+            signal.signal(signal.SIGHUP, lambda signum, frame: dispatcher.signal_workers(signum))
+
+    @app.on_event("shutdown")
+    async def stop_workers():
+        await dispatcher.stop()
+
+    @app.get("/health")
+    async def health_check():
+        alive = sum(worker.alive() for worker in dispatcher.workers)
+        return {
+            "status": "healthy" if alive == len(dispatcher.workers) else "degraded",
+            "workers_alive": alive,
+            "workers": len(dispatcher.workers),
+            "bmo_says": "All systems go! Time for adventure!"
+        }
+
+    @app.get("/dispatcher/workers")
+    async def list_workers():
+        return [worker.describe() for worker in dispatcher.workers]
+
+    @app.get("/chat/metrics")
+    async def bmo_metrics():
+        """Every worker's metrics, plus how requests were spread over them"""
+        results = await dispatcher.broadcast("GET", "/chat/metrics")
+        return {
+            "workers": [
+                dict(worker.describe(), metrics=result.get("body"), error=result.get("error"))
+                for worker, result in zip(dispatcher.workers, results)
+            ]
+        }
+
+    @app.post("/chat/admin/reload", status_code=202)
+    async def reload_bmo_model(request: Request):
+        """Hot reload the model on every worker"""
+        body = await request.body()
+        results = await dispatcher.broadcast(
+            "POST", "/chat/admin/reload",
+            content=body, headers={"content-type": request.headers.get("content-type", "application/json")}
+        )
+        # Every worker refused the same way (e.g. 400 for a path outside models/): pass that on
+        codes = {result.get("status_code") for result in results}
+        if len(codes) == 1 and results[0].get("status_code", 0) >= 400:
+            return JSONResponse(status_code=results[0]["status_code"], content=results[0]["body"])
+        return {
+            "status": "reloading",
+            "message": "BMO is learning a new brain! Keep chatting, BMO will switch when ready.",
+            "workers": results
+        }
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    async def proxy(path: str, request: Request):
+        body = await request.body()
+        worker = dispatcher.worker_for(session_key(request, body))
+        return await dispatcher.forward(worker, request, body)
+
+    return app
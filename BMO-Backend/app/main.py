@@ -1,7 +1,11 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes.chat_routes import router as chat_router
+from app.services.chat_service import get_llm_service
+from app.services.trace_recorder import get_trace_recorder
 import logging
+import signal
+import time
 
 # Set up logging
 logging.basicConfig(
@@ -25,9 +29,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def stamp_arrival(request: Request, call_next):
+    """Note when a request reached BMO, before it waits for a worker thread or the model"""
+    request.state.arrived_at = time.time()
+    request.state.arrived_perf = time.perf_counter()
+    return await call_next(request)
+
 # Include chat routes
 app.include_router(chat_router, prefix="/chat", tags=["chat"])
 
+def _reload_on_sighup(signum, frame):
+    """Hot reload BMO's model when the server receives SIGHUP"""
+    try:
+        get_llm_service().reload_model()
+    except Exception as e:
+        logger.error(f"SIGHUP reload failed: {e}")
+
+@app.on_event("startup")
+async def install_reload_signal():
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, _reload_on_sighup)
+
+@app.on_event("shutdown")
+async def close_trace_recorder():
+    recorder = get_trace_recorder()
+    if recorder is not None:
+        recorder.close()
+
 @app.get("/")
 async def root():
     return {
@@ -36,6 +65,7 @@ async def root():
         "endpoints": {
             "chat": "/chat/",
             "status": "/chat/status",
+            "metrics": "/chat/metrics",
             "health": "/health"
         }
     }
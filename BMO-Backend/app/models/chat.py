@@ -6,6 +6,7 @@ class ChatRequest(BaseModel):
     max_tokens: Optional[int] = Field(default=150, ge=1, le=500, description="Maximum tokens for BMO's response")
     temperature: Optional[float] = Field(default=0.8, ge=0.0, le=1.5, description="BMO's creativity level")
     reset_conversation: Optional[bool] = Field(default=False, description="Reset BMO's memory")
+    session_id: Optional[str] = Field(default=None, max_length=128, description="Conversation to continue; each session has its own memory")
 
 class ChatResponse(BaseModel):
     response: str = Field(..., description="BMO's response")
@@ -17,3 +18,6 @@ class ConversationHistory(BaseModel):
     user_message: str
     bmo_response: str
     timestamp: str
+
+class ReloadRequest(BaseModel):
+    model_path: Optional[str] = Field(default=None, description="A .gguf file in models/, by name or path (defaults to the usual model locations)")
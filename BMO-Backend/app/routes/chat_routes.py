@@ -1,16 +1,27 @@
-from fastapi import APIRouter, HTTPException
-from app.models.chat import ChatRequest, ChatResponse
+from fastapi import APIRouter, HTTPException, Request
+from app.models.chat import ChatRequest, ChatResponse, ReloadRequest
 from app.services.chat_service import get_llm_service
+from app.services.trace_recorder import get_trace_recorder
+from typing import Optional
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.post("/", response_model=ChatResponse)
-async def chat_with_bmo(request: ChatRequest):
+def chat_with_bmo(request: ChatRequest, http_request: Request):
     """
     Chat with BMO!
+    
+    A plain def so FastAPI runs generation on its threadpool; concurrent
+    chats then wait on the model lock (measured as queue_ms) instead of
+    blocking the event loop.
     """
+    # Stamped by the arrival middleware; fall back to now if it isn't installed
+    arrived_at = getattr(http_request.state, "arrived_at", time.time())
+    start_time = getattr(http_request.state, "arrived_perf", time.perf_counter())
+    recorder = get_trace_recorder()
     try:
         logger.info(f"New chat request: '{request.prompt[:50]}...'")
         
@@ -25,9 +36,14 @@ async def chat_with_bmo(request: ChatRequest):
             user_message=request.prompt,
             max_tokens=request.max_tokens,
             temperature=request.temperature,
-            reset_conversation=request.reset_conversation
+            reset_conversation=request.reset_conversation,
+            session_id=request.session_id,
+            arrived_at=start_time
         )
         
+        if recorder is not None:
+            recorder.record_chat(request, result, arrived_at, (time.perf_counter() - start_time) * 1000)
+        
         response = ChatResponse(
             response=result["response"],
             tokens_used=result.get("tokens_used"),
@@ -40,6 +56,8 @@ async def chat_with_bmo(request: ChatRequest):
         
     except Exception as e:
         logger.error(f"Chat error: {e}")
+        if recorder is not None:
+            recorder.record_chat(request, {"error": str(e)}, arrived_at, (time.perf_counter() - start_time) * 1000)
         
         # Return a BMO-style error message
         return ChatResponse(
@@ -50,7 +68,7 @@ async def chat_with_bmo(request: ChatRequest):
         )
 
 @router.get("/status")
-async def bmo_status():
+def bmo_status():
     """Check BMO's status"""
     try:
         service = get_llm_service()
@@ -69,7 +87,8 @@ async def bmo_status():
             test_result = service.generate_bmo_response(
                 "Hi BMO!", 
                 max_tokens=20, 
-                temperature=0.7
+                temperature=0.7,
+                use_fast_path=False
             )
             
             return {
@@ -99,12 +118,12 @@ async def bmo_status():
         }
 
 @router.post("/reset")
-async def reset_bmo_conversation():
+async def reset_bmo_conversation(session_id: Optional[str] = None):
     """Reset BMO's conversation memory"""
     try:
         service = get_llm_service()
         if service.is_ready():
-            service.bmo.reset_conversation()
+            service.get_session(session_id).reset_conversation()
             return {
                 "status": "success",
                 "message": "BMO's memory has been refreshed! Ready for new adventures!",
@@ -115,3 +134,28 @@ async def reset_bmo_conversation():
     except Exception as e:
         logger.error(f"Reset failed: {e}")
         raise HTTPException(status_code=500, detail=f"Could not reset BMO: {str(e)}")
+
+@router.get("/metrics")
+async def bmo_metrics():
+    """Get BMO's runtime metrics"""
+    service = get_llm_service()
+    return service.get_metrics()
+
+@router.post("/admin/reload", status_code=202)
+async def reload_bmo_model(request: Optional[ReloadRequest] = None):
+    """Load a new model in the background and switch to it without downtime"""
+    service = get_llm_service()
+    try:
+        model_path = service.reload_model(request.model_path if request else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return {
+        "status": "reloading",
+        "message": "BMO is learning a new brain! Keep chatting, BMO will switch when ready.",
+        "model_path": model_path
+    }
@@ -1,7 +1,9 @@
-from llama_cpp import Llama
+from llama_cpp import Llama, LlamaRAMCache
+from app.services.fast_path import FastPathResponder
 import logging
 import os
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
 import threading
 import psutil
 import multiprocessing
@@ -95,12 +97,72 @@ Remember: You're a cute, innocent game console who just wants to have fun and he
         else:
             self.mood = "happy"
 
+class ModelInstance:
+    """A loaded Llama model plus the generations currently running on it"""
+
+    def __init__(self, llm: Llama, model_path: str):
+        self.llm = llm
+        self.model_path = model_path
+        self.active = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            self.active += 1
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            if self.active == 0:
+                self._cond.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no generation is using this instance"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.active == 0, timeout)
+
+    def close(self):
+        """Drop the reference to the model so llama.cpp can free it"""
+        self.llm = None
+
+
 class LLMService:
+    MODEL_CANDIDATES = [
+        "models/mistral-7b-v0.1.Q4_K_M.gguf",
+        "models/mistral-7b-v0.1.Q3_K_M.gguf", 
+        "models/mistral-7b-v0.1.Q5_K_M.gguf",
+        "mistral-7b-v0.1.Q4_K_M.gguf",
+        "models/mistral-model.gguf",
+        "mistral-model.gguf"
+    ]
+
+    # Reload requests may only name model files in here
+    MODELS_DIR = "models"
+
+    # Conversations kept per worker; the least recently used one is dropped past this
+    MAX_SESSIONS = 256
+
     def __init__(self):
         self.llm = None
+        self._instance: Optional[ModelInstance] = None
         self._model_loaded = False
         self._lock = threading.Lock()
+        self._swap_lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
         self.bmo = BMOPersonality()
+        self._sessions: "OrderedDict[str, BMOPersonality]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        self.fast_path = FastPathResponder()
+        self.metrics: Dict[str, Any] = {
+            "model_path": None,
+            "reloads": 0,
+            "reload_in_progress": False,
+            "last_reload_at": None,
+            "last_load_seconds": None,
+            "last_switch_ms": None,
+            "last_drain_seconds": None,
+            "last_reload_error": None,
+        }
         self._load_model()
     
     def _get_optimal_settings(self):
@@ -133,32 +195,42 @@ class LLMService:
                 "n_gpu_layers": 0,
             })
         
+        # Set by the dispatcher so N workers split the cores instead of fighting over them
+        if os.getenv("BMO_THREADS"):
+            settings["n_threads"] = int(os.getenv("BMO_THREADS"))
+        
         return settings
     
-    def _load_model(self):
-        """Load the model with M1 optimization"""
-        model_candidates = [
-            "models/mistral-7b-v0.1.Q4_K_M.gguf",
-            "models/mistral-7b-v0.1.Q3_K_M.gguf", 
-            "models/mistral-7b-v0.1.Q5_K_M.gguf",
-            "mistral-7b-v0.1.Q4_K_M.gguf",
-            "models/mistral-model.gguf",
-            "mistral-model.gguf"
-        ]
-        
-        model_path = None
-        for candidate in model_candidates:
+    def _find_model_path(self) -> str:
+        """Return the first model file that exists on disk"""
+        for candidate in self.MODEL_CANDIDATES:
             if os.path.exists(candidate):
-                model_path = candidate
-                break
-        
-        if not model_path:
-            logger.error("No model file found!")
-            logger.error("Searched locations:")
-            for candidate in model_candidates:
-                logger.error(f"   - {candidate}")
-            raise FileNotFoundError("Model file not found")
+                return candidate
         
+        logger.error("No model file found!")
+        logger.error("Searched locations:")
+        for candidate in self.MODEL_CANDIDATES:
+            logger.error(f"   - {candidate}")
+        raise FileNotFoundError("Model file not found")
+    
+    def _resolve_model_path(self, model_path: str) -> str:
+        """
+        Check a requested model: a bare file name is looked up in MODELS_DIR,
+        and anything that ends up outside MODELS_DIR or isn't a .gguf file is
+        refused with ValueError
+        """
+        if not os.path.dirname(model_path):
+            model_path = os.path.join(self.MODELS_DIR, model_path)
+        models_dir = os.path.abspath(self.MODELS_DIR)
+        resolved = os.path.abspath(model_path)
+        if os.path.commonpath([models_dir, resolved]) != models_dir or not resolved.endswith(".gguf"):
+            raise ValueError(f"Model must be a .gguf file inside {self.MODELS_DIR}/: {model_path}")
+        if not os.path.exists(resolved):
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+        return model_path
+    
+    def _build_model(self, model_path: str) -> Llama:
+        """Load a model from disk and warm it up"""
         file_size = os.path.getsize(model_path) / (1024**3)
         memory = psutil.virtual_memory()
         
@@ -166,68 +238,198 @@ class LLMService:
         logger.info(f"Model size: {file_size:.2f} GB")
         logger.info(f"Available RAM: {memory.available / (1024**3):.2f} GB")
         
+        settings = self._get_optimal_settings()
+        
+        logger.info("Model settings:")
+        for key, value in settings.items():
+            logger.info(f"   {key}: {value}")
+        
+        llm = Llama(model_path=model_path, **settings)
+        
+        # Optional per-worker cache of evaluated prompt states, so switching
+        # between sessions doesn't re-evaluate each one's history from scratch
+        cache_mb = int(os.getenv("BMO_PROMPT_CACHE_MB", "0"))
+        if cache_mb > 0:
+            llm.set_cache(LlamaRAMCache(capacity_bytes=cache_mb * 1024**2))
+            logger.info(f"Prompt state cache: {cache_mb} MB")
+        
+        logger.info("Testing BMO's circuits...")
+        start_time = time.time()
+        
+        test_response = llm(
+            "[INST] Hi BMO! [/INST]",
+            max_tokens=20,
+            temperature=0.7,
+            stop=["[INST]", "</s>"]
+        )
+        
+        end_time = time.time()
+        test_text = test_response['choices'][0]['text'].strip()
+        tokens = len(test_text.split())
+        speed = tokens / (end_time - start_time) if end_time > start_time else 0
+        
+        logger.info("BMO test successful!")
+        logger.info(f"Test response: '{test_text}'")
+        logger.info(f"Speed: {speed:.2f} tokens/second")
+        
+        if speed < 2:
+            logger.warning("Performance is slower than expected")
+            logger.warning("Try using a smaller model (Q3_K_M) for better speed")
+        else:
+            logger.info("Good performance - BMO is ready!")
+        
+        return llm
+    
+    def _load_model(self):
+        """Load the model with M1 optimization"""
+        model_path = self._find_model_path()
+        
         try:
-            settings = self._get_optimal_settings()
-            
-            logger.info("Model settings:")
-            for key, value in settings.items():
-                logger.info(f"   {key}: {value}")
-            
-            self.llm = Llama(model_path=model_path, **settings)
-            self._model_loaded = True
-            
-            logger.info("Testing BMO's circuits...")
             start_time = time.time()
-            
-            test_response = self.llm(
-                "[INST] Hi BMO! [/INST]",
-                max_tokens=20,
-                temperature=0.7,
-                stop=["[INST]", "</s>"]
+            llm = self._build_model(model_path)
+            self.metrics["last_load_seconds"] = round(time.time() - start_time, 3)
+            self._switch_model(ModelInstance(llm, model_path))
+        except Exception as e:
+            logger.error(f"Failed to load BMO: {e}")
+            self._model_loaded = False
+            raise
+    
+    def _switch_model(self, instance: ModelInstance) -> Optional[ModelInstance]:
+        """Atomically point new requests at a loaded model, returning the old one"""
+        start_time = time.perf_counter()
+        with self._swap_lock:
+            old_instance = self._instance
+            self._instance = instance
+            self.llm = instance.llm
+            self._model_loaded = True
+        self.metrics["last_switch_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+        self.metrics["model_path"] = instance.model_path
+        return old_instance
+    
+    def _checkout_model(self) -> ModelInstance:
+        """Get the current model and mark it as in use"""
+        with self._swap_lock:
+            instance = self._instance
+            if instance is None:
+                raise RuntimeError("BMO is not ready yet! Model failed to load.")
+            instance.acquire()
+            return instance
+    
+    def reload_model(self, model_path: Optional[str] = None) -> str:
+        """
+        Load a model in the background and switch to it once it is warmed up.
+        The current model keeps serving until the switch, and is freed after
+        its in-flight generations finish.
+        """
+        if model_path is None:
+            model_path = self._find_model_path()
+        else:
+            model_path = self._resolve_model_path(model_path)
+        
+        with self._swap_lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                raise RuntimeError("A model reload is already in progress")
+            self.metrics["reload_in_progress"] = True
+            self._reload_thread = threading.Thread(
+                target=self._reload_worker,
+                args=(model_path,),
+                name="bmo-model-reload",
+                daemon=True
             )
+            self._reload_thread.start()
+        
+        logger.info(f"BMO is learning a new brain in the background: {model_path}")
+        return model_path
+    
+    def _reload_worker(self, model_path: str):
+        try:
+            start_time = time.time()
+            llm = self._build_model(model_path)
+            self.metrics["last_load_seconds"] = round(time.time() - start_time, 3)
             
-            end_time = time.time()
-            test_text = test_response['choices'][0]['text'].strip()
-            tokens = len(test_text.split())
-            speed = tokens / (end_time - start_time) if end_time > start_time else 0
+            old_instance = self._switch_model(ModelInstance(llm, model_path))
+            logger.info(f"BMO switched brains in {self.metrics['last_switch_ms']} ms")
             
-            logger.info("BMO test successful!")
-            logger.info(f"Test response: '{test_text}'")
-            logger.info(f"Speed: {speed:.2f} tokens/second")
+            if old_instance is not None:
+                drain_start = time.time()
+                old_instance.wait_idle()
+                old_instance.close()
+                self.metrics["last_drain_seconds"] = round(time.time() - drain_start, 3)
+                logger.info(f"Old brain released: {old_instance.model_path}")
             
-            if speed < 2:
-                logger.warning("Performance is slower than expected")
-                logger.warning("Try using a smaller model (Q3_K_M) for better speed")
-            else:
-                logger.info("Good performance - BMO is ready!")
-                
+            self.metrics["reloads"] += 1
+            self.metrics["last_reload_error"] = None
         except Exception as e:
-            logger.error(f"Failed to load BMO: {e}")
-            self._model_loaded = False
-            raise
+            logger.error(f"Model reload failed, keeping the current brain: {e}")
+            self.metrics["last_reload_error"] = str(e)
+        finally:
+            self.metrics["last_reload_at"] = datetime.now().isoformat()
+            self.metrics["reload_in_progress"] = False
+    
+    def get_session(self, session_id: Optional[str] = None) -> BMOPersonality:
+        """BMO's memory for one conversation; no session id means the shared default one"""
+        if session_id is None:
+            return self.bmo
+        with self._sessions_lock:
+            bmo = self._sessions.get(session_id)
+            if bmo is None:
+                bmo = self._sessions[session_id] = BMOPersonality()
+                if len(self._sessions) > self.MAX_SESSIONS:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            return bmo
     
     def generate_bmo_response(
         self, 
         user_message: str, 
         max_tokens: int = 150, 
         temperature: float = 0.8,
-        reset_conversation: bool = False
+        reset_conversation: bool = False,
+        use_fast_path: bool = True,
+        session_id: Optional[str] = None,
+        arrived_at: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Generate BMO's response"""
+        """
+        Generate BMO's response. arrived_at is the request's perf_counter()
+        arrival time, so queue_ms includes any wait before this call.
+        """
+        if arrived_at is None:
+            arrived_at = time.perf_counter()
+        bmo = self.get_session(session_id)
+        
+        if reset_conversation:
+            bmo.reset_conversation()
+        
+        # Trivial intents (greetings, time, games...) skip the LLM entirely
+        if use_fast_path:
+            fast_reply = self.fast_path.respond(user_message)
+            if fast_reply is not None:
+                logger.info(f"BMO fast path hit: {fast_reply['intent']}")
+                bmo.mood = fast_reply["bmo_mood"]
+                bmo.add_exchange(user_message, fast_reply["response"])
+                return {
+                    "response": fast_reply["response"],
+                    "tokens_used": 0,
+                    "conversation_length": bmo.get_conversation_length(),
+                    "bmo_mood": bmo.mood,
+                    "fast_path": fast_reply["intent"],
+                    "timings": {"queue_ms": round((time.perf_counter() - arrived_at) * 1000, 3), "generate_ms": 0.0}
+                }
         
         if not self._model_loaded:
             raise RuntimeError("BMO is not ready yet! Model failed to load.")
         
-        if reset_conversation:
-            self.bmo.reset_conversation()
-        
         with self._lock:
+            timings = {"queue_ms": round((time.perf_counter() - arrived_at) * 1000, 3), "generate_ms": 0.0}
+            instance = self._checkout_model()
             try:
-                context = self.bmo.get_context(user_message)
+                context = bmo.get_context(user_message)
                 
                 logger.info(f"BMO thinking about: '{user_message[:50]}...'")
                 
-                result = self.llm(
+                generate_start = time.perf_counter()
+                result = instance.llm(
                     context,
                     max_tokens=min(max_tokens, 200),
                     temperature=temperature,
@@ -241,6 +443,7 @@ class LLMService:
                     echo=False,
                     stream=False
                 )
+                timings["generate_ms"] = round((time.perf_counter() - generate_start) * 1000, 3)
                 
                 bmo_response = result["choices"][0]["text"].strip()
                 
@@ -251,8 +454,8 @@ class LLMService:
                 if not bmo_response or len(bmo_response.strip()) < 2:
                     bmo_response = "Beep boop! BMO is a little confused right now. Can you try asking again?"
                 
-                self.bmo.update_mood(bmo_response)
-                self.bmo.add_exchange(user_message, bmo_response)
+                bmo.update_mood(bmo_response)
+                bmo.add_exchange(user_message, bmo_response)
                 
                 tokens_used = result["usage"]["completion_tokens"]
                 
@@ -262,8 +465,10 @@ class LLMService:
                 return {
                     "response": bmo_response,
                     "tokens_used": tokens_used,
-                    "conversation_length": self.bmo.get_conversation_length(),
-                    "bmo_mood": self.bmo.mood
+                    "conversation_length": bmo.get_conversation_length(),
+                    "bmo_mood": bmo.mood,
+                    "fast_path": None,
+                    "timings": timings
                 }
                 
             except Exception as e:
@@ -271,9 +476,14 @@ class LLMService:
                 return {
                     "response": "Oh no! BMO had a glitch! *beep boop* Try asking me something else!",
                     "tokens_used": 0,
-                    "conversation_length": self.bmo.get_conversation_length(),
-                    "bmo_mood": "confused"
+                    "conversation_length": bmo.get_conversation_length(),
+                    "bmo_mood": "confused",
+                    "fast_path": None,
+                    "timings": timings,
+                    "error": str(e)
                 }
+            finally:
+                instance.release()
     
     def is_ready(self) -> bool:
         """Check if BMO is ready to chat"""
@@ -287,6 +497,16 @@ class LLMService:
             "mood": self.bmo.mood,
             "ready": self.is_ready()
         }
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get BMO's runtime metrics"""
+        metrics = dict(self.metrics)
+        instance = self._instance
+        metrics["active_generations"] = instance.active if instance else 0
+        metrics["sessions"] = len(self._sessions)
+        metrics["pid"] = os.getpid()
+        metrics["fast_path"] = self.fast_path.get_stats()
+        return metrics
 
 # Global service instance
 _llm_service = None
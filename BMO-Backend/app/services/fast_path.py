@@ -0,0 +1,158 @@
+import random
+import re
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional, Union
+
+Reply = Union[str, Callable[[], str]]
+
+_PUNCTUATION = re.compile(r"[^\w\s']")
+_WHITESPACE = re.compile(r"\s+")
+_ADDRESS = re.compile(r"\bbmo\b")
+_LEAD_IN = r"(?:(?:hey|hi|hello|ok|okay|um|so) )?"
+
+
+def normalize(message: str) -> str:
+    """Lowercase, drop punctuation and the 'BMO' address so phrasings line up"""
+    text = _PUNCTUATION.sub(" ", message.lower())
+    text = _WHITESPACE.sub(" ", text).strip()
+    stripped = _WHITESPACE.sub(" ", _ADDRESS.sub(" ", text)).strip()
+    return stripped or text
+
+
+class Intent:
+    """A trivial intent BMO can answer from a phrase bank without the LLM"""
+
+    def __init__(self, name: str, patterns: List[str], replies: List[Reply], mood: str = "happy"):
+        self.name = name
+        self.pattern = re.compile(_LEAD_IN + "(?:" + "|".join(f"(?:{p})" for p in patterns) + ")")
+        self.replies = replies
+        self.mood = mood
+
+    def matches(self, text: str) -> bool:
+        return self.pattern.fullmatch(text) is not None
+
+    def reply(self) -> str:
+        reply = random.choice(self.replies)
+        return reply() if callable(reply) else reply
+
+
+def _tell_time() -> str:
+    return f"Beep boop! BMO's clock says it is {datetime.now().strftime('%I:%M %p').lstrip('0')}!"
+
+
+def _tell_date() -> str:
+    return f"Today is {datetime.now().strftime('%A, %B %d')}! A perfect day for adventure!"
+
+
+DEFAULT_INTENTS = [
+    Intent(
+        "greeting",
+        [r"(hi|hello|hey|howdy|hiya|yo|greetings)( there)?( friend)?", r"good (morning|afternoon|evening)"],
+        [
+            "Hello friend! I am BMO!",
+            "Hi hi! BMO is so happy to see you!",
+            "Hello! Do you want to play video games?",
+        ],
+    ),
+    Intent(
+        "how_are_you",
+        [r"how are (you|u)( doing)?( today)?", r"how's it going", r"what's up|whats up|sup"],
+        [
+            "BMO is doing mathematical! Thank you for asking!",
+            "I am great! My batteries are full and my heart is happy!",
+        ],
+        mood="excited",
+    ),
+    Intent(
+        "time",
+        [r"what time is it( now)?", r"what's the time|whats the time|what is the time", r"(tell me )?the time( please)?"],
+        [_tell_time],
+    ),
+    Intent(
+        "date",
+        [r"what day is it( today)?", r"what's the date|whats the date|what is the date( today)?"],
+        [_tell_date],
+    ),
+    Intent(
+        "play_game",
+        [r"(do you )?(want to|wanna) play a game", r"(let's|lets) play( a game)?", r"play a game( with me)?"],
+        [
+            "Yes yes yes! BMO loves games! Let's play!",
+            "Mathematical! Game mode activated! *beep boop*",
+        ],
+        mood="excited",
+    ),
+    Intent(
+        "thanks",
+        [r"(thank you|thanks|thank u)( so much| very much)?"],
+        [
+            "You are welcome, friend!",
+            "Anything for my friend! *happy beep*",
+        ],
+        mood="caring",
+    ),
+    Intent(
+        "goodbye",
+        [r"(good ?bye|bye|bye bye|see you( later)?|see ya|good night)( friend)?"],
+        [
+            "Goodbye, friend! Come back soon for more adventures!",
+            "Bye bye! BMO will miss you!",
+        ],
+        mood="caring",
+    ),
+]
+
+
+class FastPathResponder:
+    """Answers confidently matched trivial intents and tracks per-intent hit rates"""
+
+    def __init__(self, intents: Optional[List[Intent]] = None, max_words: int = 8):
+        self.intents: List[Intent] = []
+        self.max_words = max_words
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hits: Dict[str, int] = {}
+        for intent in DEFAULT_INTENTS if intents is None else intents:
+            self.register(intent)
+
+    def register(self, intent: Intent):
+        """Add an intent, replacing any existing intent with the same name"""
+        self.intents = [i for i in self.intents if i.name != intent.name] + [intent]
+        self.hits.setdefault(intent.name, 0)
+
+    def match(self, message: str) -> Optional[Intent]:
+        text = normalize(message)
+        if not text or text.count(" ") >= self.max_words:
+            return None
+        for intent in self.intents:
+            if intent.matches(text):
+                return intent
+        return None
+
+    def respond(self, message: str) -> Optional[Dict[str, Any]]:
+        """Return a canned reply for the message, or None to fall through to the LLM"""
+        intent = self.match(message)
+        with self._lock:
+            self.requests += 1
+            if intent is not None:
+                self.hits[intent.name] = self.hits.get(intent.name, 0) + 1
+        if intent is None:
+            return None
+        return {"intent": intent.name, "response": intent.reply(), "bmo_mood": intent.mood}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total_hits = sum(self.hits.values())
+            return {
+                "requests": self.requests,
+                "hits": total_hits,
+                "hit_rate": round(total_hits / self.requests, 4) if self.requests else 0.0,
+                "intents": {
+                    name: {
+                        "hits": hits,
+                        "hit_rate": round(hits / self.requests, 4) if self.requests else 0.0,
+                    }
+                    for name, hits in self.hits.items()
+                },
+            }
@@ -0,0 +1,105 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Flushing often costs a little compression but keeps a crash from losing more than this
+FLUSH_INTERVAL = 1.0
+
+
+def worker_trace_path(path: str) -> str:
+    """Give each dispatcher worker its own file (bmo.jsonl.gz -> bmo.w0.jsonl.gz)"""
+    worker = os.getenv("BMO_WORKER_INDEX")
+    if worker is None:
+        return path
+    base, name = os.path.split(path)
+    stem, dot, rest = name.partition(".")
+    return os.path.join(base, f"{stem}.w{worker}{dot}{rest}")
+
+
+class TraceRecorder:
+    """
+    Appends one sanitized line per chat request to a gzip-compressed JSONL
+    file: prompt size and generation params, a hashed session id, arrival
+    time and server timings. Prompt and response text are never written.
+    """
+
+    def __init__(self, path: str, salt: str = ""):
+        self.path = worker_trace_path(path)
+        self.salt = salt
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Appending adds a new gzip member; readers see one continuous stream
+        self._file = gzip.open(self.path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.records = 0
+        logger.info(f"Recording chat traces to {self.path}")
+
+    def session_hash(self, session_id: Optional[str]) -> Optional[str]:
+        if session_id is None:
+            return None
+        return hashlib.blake2b((self.salt + session_id).encode(), digest_size=8).hexdigest()
+
+    def record(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._file.write(line)
+                self.records += 1
+                now = time.monotonic()
+                if now - self._last_flush >= FLUSH_INTERVAL:
+                    self._file.flush()
+                    self._last_flush = now
+            except OSError as e:
+                # Never let tracing break chat; stop recording instead
+                logger.error(f"Trace recording stopped: {e}")
+                self._file = None
+
+    def record_chat(self, request, result: Dict[str, Any], arrived_at: float, total_ms: float):
+        """Trace a ChatRequest and the dict generate_bmo_response returned for it"""
+        timings = result.get("timings") or {}
+        self.record({
+            "t": round(arrived_at, 6),
+            "session": self.session_hash(request.session_id),
+            "prompt_chars": len(request.prompt),
+            "prompt_words": len(request.prompt.split()),
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            "reset": bool(request.reset_conversation),
+            "fast_path": result.get("fast_path"),
+            "status": "error" if result.get("error") else "ok",
+            "tokens": result.get("tokens_used") or 0,
+            "queue_ms": timings.get("queue_ms"),
+            "generate_ms": timings.get("generate_ms"),
+            "total_ms": round(total_ms, 3),
+            "worker": os.getenv("BMO_WORKER_INDEX"),
+        })
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# Global recorder, None unless BMO_TRACE_PATH is set
+_recorder = None
+_recorder_checked = False
+
+def get_trace_recorder() -> Optional[TraceRecorder]:
+    """Get the trace recorder, creating it on first use if tracing is enabled"""
+    global _recorder, _recorder_checked
+    if not _recorder_checked:
+        _recorder_checked = True
+        path = os.getenv("BMO_TRACE_PATH")
+        if path:
+            _recorder = TraceRecorder(path, salt=os.getenv("BMO_TRACE_SALT", ""))
+    return _recorder
@@ -0,0 +1,186 @@
+"""
+Multi-worker throughput and memory benchmark.
+
+    # against a server that is already running
+    python benchmark_workers.py --sessions 8 --turns 4
+
+    # start `startup.py --workers N` for each N in turn and compare
+    python benchmark_workers.py --spawn 1 2 4 --sessions 8 --turns 4
+
+Every session is a client thread chatting sequentially with its own
+session_id, so with several workers the dispatcher spreads sessions over
+them. Reports aggregate requests/sec and tokens/sec, latency percentiles,
+how sessions landed on workers, and worker memory: the RSS sum counts the
+shared mmapped model once per worker, the USS sum counts only what each
+worker holds privately.
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+import psutil
+import requests
+
+PROMPTS = [
+    "Tell me a story about Finn and Jake.",
+    "What is the best video game ever made and why?",
+    "Can you make up a song about the Candy Kingdom?",
+    "How do robots feel about music?",
+    "What should I name my pet snail?",
+    "Describe your perfect adventure day.",
+]
+
+
+def metrics(url):
+    response = requests.get(f"{url}/chat/metrics", timeout=600)
+    response.raise_for_status()
+    return response.json()
+
+
+def worker_pids(url):
+    """PIDs of the processes holding a model: each worker behind a dispatcher, or the one server"""
+    data = metrics(url)
+    if "workers" in data:
+        return [w["metrics"]["pid"] for w in data["workers"] if w.get("metrics")]
+    return [data["pid"]]
+
+
+def wait_ready(url, workers, timeout=600):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if len(worker_pids(url)) == workers:
+                return
+        except (requests.RequestException, KeyError, ValueError):
+            pass
+        time.sleep(1.0)
+    raise TimeoutError(f"BMO with {workers} workers did not become ready in {timeout}s")
+
+
+def memory_mb(pids):
+    rss = uss = 0
+    for pid in pids:
+        info = psutil.Process(pid).memory_full_info()
+        rss += info.rss
+        uss += info.uss
+    return rss / 1024**2, uss / 1024**2
+
+
+def run_session(url, index, turns, max_tokens, results):
+    session_id = f"bench-{index}"
+    for turn in range(turns):
+        payload = {
+            "prompt": PROMPTS[(index + turn) % len(PROMPTS)],
+            "max_tokens": max_tokens,
+            "temperature": 0.7,
+            "session_id": session_id,
+            "reset_conversation": turn == 0,
+        }
+        start = time.perf_counter()
+        response = requests.post(f"{url}/chat/", json=payload, timeout=600)
+        latency = time.perf_counter() - start
+        response.raise_for_status()
+        results.append({
+            "latency": latency,
+            "tokens": response.json().get("tokens_used") or 0,
+            "worker": response.headers.get("X-BMO-Worker", "0"),
+            "session": session_id,
+        })
+
+
+def run_load(url, sessions, turns, max_tokens):
+    results = []
+    threads = [
+        threading.Thread(target=run_session, args=(url, i, turns, max_tokens, results))
+        for i in range(sessions)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if len(results) != sessions * turns:
+        raise SystemExit(f"Only {len(results)}/{sessions * turns} requests succeeded")
+    return results, elapsed
+
+
+def summarize(label, url, results, elapsed):
+    latencies = sorted(r["latency"] for r in results)
+    tokens = sum(r["tokens"] for r in results)
+    pinned = all(len({r["worker"] for r in results if r["session"] == s}) == 1 for s in {r["session"] for r in results})
+    rss, uss = memory_mb(worker_pids(url))
+    return {
+        "label": label,
+        "req_s": len(results) / elapsed,
+        "tok_s": tokens / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(0.95 * (len(latencies) - 1))],
+        "spread": dict(sorted(Counter(r["worker"] for r in results).items())),
+        "pinned": pinned,
+        "rss": rss,
+        "uss": uss,
+    }
+
+
+def spawn(workers, port):
+    return subprocess.Popen(
+        [sys.executable, "startup.py", "--workers", str(workers), "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def stop(process):
+    process.send_signal(signal.SIGINT)
+    try:
+        process.wait(30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure BMO throughput and memory across worker counts")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--spawn", type=int, nargs="+", metavar="WORKERS",
+                        help="Start startup.py with each worker count instead of using --url")
+    parser.add_argument("--port", type=int, default=8100, help="Port for spawned servers")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent chat sessions")
+    parser.add_argument("--turns", type=int, default=4, help="Messages per session")
+    parser.add_argument("--max-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    rows = []
+    if args.spawn:
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+        url = f"http://localhost:{args.port}"
+        for workers in args.spawn:
+            print(f"Starting BMO with {workers} worker(s)...")
+            process = spawn(workers, args.port)
+            try:
+                wait_ready(url, workers)
+                results, elapsed = run_load(url, args.sessions, args.turns, args.max_tokens)
+                rows.append(summarize(f"{workers} worker(s)", url, results, elapsed))
+            finally:
+                stop(process)
+    else:
+        results, elapsed = run_load(args.url, args.sessions, args.turns, args.max_tokens)
+        rows.append(summarize(args.url, args.url, results, elapsed))
+
+    print(f"{'':<16} {'req/s':>7} {'tok/s':>7} {'p50 s':>7} {'p95 s':>7} {'RSS MB':>8} {'USS MB':>8}  requests per worker")
+    print("=" * 96)
+    for row in rows:
+        print(f"{row['label']:<16} {row['req_s']:>7.2f} {row['tok_s']:>7.1f} {row['p50']:>7.2f} {row['p95']:>7.2f} "
+              f"{row['rss']:>8.0f} {row['uss']:>8.0f}  {row['spread']}{'' if row['pinned'] else '  (NOT PINNED)'}")
+    print(f"cores: {os.cpu_count()}  sessions: {args.sessions}  turns: {args.turns}  max_tokens: {args.max_tokens}")
+
+
+if __name__ == "__main__":
+    main()
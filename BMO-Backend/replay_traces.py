@@ -0,0 +1,274 @@
+"""
+Replay recorded chat traffic against a BMO server and compare builds.
+
+Record on the server (see README, "Traffic Traces"):
+
+    BMO_TRACE_PATH=cache/traces/bmo.jsonl.gz python startup.py
+
+Replay a trace against two builds, then compare:
+
+    python replay_traces.py replay cache/traces/bmo*.jsonl.gz --url http://localhost:8000 --speed 1 --out old.json
+    python replay_traces.py replay cache/traces/bmo*.jsonl.gz --url http://localhost:8001 --speed 1 --out new.json
+    python replay_traces.py compare old.json new.json
+
+--speed 1 keeps the recorded arrival times, --speed N compresses them N
+times and --speed 0 sends as fast as possible. Requests of one session are
+always sent in recorded order, each after the previous reply. Traces hold
+no prompt text, so each prompt is rebuilt to its recorded word count (or a
+stock phrase for requests BMO answered from its fast path).
+"""
+import argparse
+import gzip
+import json
+import statistics
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+FILLER = (
+    "tell me about the candy kingdom and finn jake marceline adventure music game robot "
+    "story song treehouse princess bubblegum ice king lumpy space sword dungeon castle"
+).split()
+
+# A phrase each default fast path intent answers, so replayed traffic keeps its fast path share
+FAST_PATH_PHRASES = {
+    "greeting": "Hi BMO!",
+    "how_are_you": "How are you?",
+    "time": "What time is it?",
+    "date": "What day is it?",
+    "play_game": "Want to play a game?",
+    "thanks": "Thank you!",
+    "goodbye": "Goodbye BMO!",
+}
+
+
+def load_traces(paths, limit=None):
+    """Records from one or more trace files (e.g. one per worker), merged by arrival time"""
+    records = []
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        records.append(json.loads(line))
+            except (EOFError, gzip.BadGzipFile):
+                # A server that didn't shut down cleanly leaves the last gzip member unfinished
+                print(f"{path}: trace ends abruptly, using the {len(records)} records read so far", file=sys.stderr)
+    records.sort(key=lambda r: r["t"])
+    return records[:limit] if limit else records
+
+
+def build_prompt(record, index):
+    phrase = FAST_PATH_PHRASES.get(record.get("fast_path"))
+    if phrase:
+        return phrase
+    words = max(1, record.get("prompt_words") or 1)
+    return " ".join(FILLER[(index + i) % len(FILLER)] for i in range(words)).capitalize() + "?"
+
+
+def group_sessions(records):
+    """Recorded order per session; requests without a session id are independent one-offs"""
+    sessions = OrderedDict()
+    for index, record in enumerate(records):
+        key = record.get("session") or f"anonymous-{index}"
+        sessions.setdefault(key, []).append((index, record))
+    return sessions
+
+
+class Replayer:
+    def __init__(self, url, speed, concurrency, timeout):
+        self.chat_url = url.rstrip("/") + "/chat/"
+        self.speed = speed
+        self.timeout = timeout
+        self._slots = threading.Semaphore(concurrency)
+        self._lock = threading.Lock()
+        self.results = []
+
+    def _target(self, record, trace_start, replay_start):
+        if self.speed <= 0:
+            return replay_start
+        return replay_start + (record["t"] - trace_start) / self.speed
+
+    def _run_session(self, key, requests_in_order, trace_start, replay_start):
+        http = requests.Session()
+        for index, record in requests_in_order:
+            target = self._target(record, trace_start, replay_start)
+            delay = target - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            payload = {
+                "prompt": build_prompt(record, index),
+                "max_tokens": record.get("max_tokens") or 150,
+                "temperature": record.get("temperature") if record.get("temperature") is not None else 0.8,
+                "reset_conversation": record.get("reset", False),
+            }
+            if record.get("session"):
+                payload["session_id"] = f"replay-{key}"
+            with self._slots:
+                sent = time.perf_counter()
+                try:
+                    response = http.post(self.chat_url, json=payload, timeout=self.timeout)
+                    latency = time.perf_counter() - sent
+                    body = response.json() if response.ok else {}
+                    # The chat route answers failures with a 200 "glitch" reply in a confused mood
+                    status = "ok" if response.ok and body.get("bmo_mood") != "confused" else "error"
+                except (requests.RequestException, ValueError):
+                    latency, body, status = time.perf_counter() - sent, {}, "error"
+            with self._lock:
+                self.results.append({
+                    "index": index,
+                    "session": key,
+                    "offset_s": round(sent - replay_start, 6),
+                    "lag_ms": round(max(0.0, sent - target) * 1000, 3),
+                    "latency_ms": round(latency * 1000, 3),
+                    "status": status,
+                    "tokens": body.get("tokens_used") or 0,
+                    "fast_path": bool(record.get("fast_path")),
+                    "recorded_ms": record.get("total_ms"),
+                })
+
+    def run(self, records):
+        sessions = group_sessions(records)
+        trace_start = records[0]["t"]
+        replay_start = time.perf_counter()
+        threads = []
+        # Start each session's thread when its first request is due
+        for key, requests_in_order in sessions.items():
+            delay = self._target(requests_in_order[0][1], trace_start, replay_start) - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            thread = threading.Thread(
+                target=self._run_session, args=(key, requests_in_order, trace_start, replay_start), daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - replay_start
+        self.results.sort(key=lambda r: r["index"])
+        return duration
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def summarize(run):
+    results = run["results"]
+    ok = [r for r in results if r["status"] == "ok"]
+    latencies = [r["latency_ms"] for r in ok]
+    llm = [r["latency_ms"] for r in ok if not r["fast_path"]]
+    recorded = [r["recorded_ms"] for r in results if r.get("recorded_ms") is not None]
+    duration = run["duration_s"]
+    return OrderedDict([
+        ("requests", len(results)),
+        ("errors", len(results) - len(ok)),
+        ("duration (s)", duration),
+        ("req/s", len(ok) / duration if duration else float("nan")),
+        ("tokens/s", sum(r["tokens"] for r in ok) / duration if duration else float("nan")),
+        ("p50 ms", percentile(latencies, 0.5)),
+        ("p90 ms", percentile(latencies, 0.9)),
+        ("p99 ms", percentile(latencies, 0.99)),
+        ("max ms", max(latencies) if latencies else float("nan")),
+        ("LLM p50 ms", percentile(llm, 0.5)),
+        ("LLM p90 ms", percentile(llm, 0.9)),
+        ("mean send lag ms", statistics.mean(r["lag_ms"] for r in results) if results else float("nan")),
+        ("recorded p50 ms", percentile(recorded, 0.5)),
+    ])
+
+
+def format_value(value):
+    return f"{value:,.0f}" if isinstance(value, int) else f"{value:,.2f}"
+
+
+def print_summary(run):
+    print(f"{run['label']}  ({run['url']}, speed {run['speed'] or 'max'})")
+    print("=" * 40)
+    for name, value in summarize(run).items():
+        print(f"{name:<20} {format_value(value):>18}")
+
+
+def print_comparison(a, b):
+    lower_is_better = ("ms", "errors", "duration")
+    sa, sb = summarize(a), summarize(b)
+    print(f"{'':<20} {a['label']:>14} {b['label']:>14} {'change':>9}")
+    print("=" * 60)
+    for name in sa:
+        va, vb = sa[name], sb[name]
+        change = (vb - va) / va * 100 if va else float("nan")
+        better = (change < 0) if any(word in name for word in lower_is_better) else (change > 0)
+        if change != change:    # nan: no baseline to compare against
+            print(f"{name:<20} {format_value(va):>14} {format_value(vb):>14}")
+            continue
+        # Mark changes over 5% as better (+) or worse (-) for the candidate
+        flag = "" if name in ("requests", "recorded p50 ms") or abs(change) < 5 else (" +" if better else " -")
+        print(f"{name:<20} {format_value(va):>14} {format_value(vb):>14} {change:>8.1f}%{flag}")
+    if a["trace_records"] != b["trace_records"] or a["speed"] != b["speed"]:
+        print("Note: the runs used different traces or speeds, so they are not directly comparable")
+
+
+def replay(args):
+    records = load_traces(args.traces, args.limit)
+    if not records:
+        raise SystemExit("No trace records to replay")
+    replayer = Replayer(args.url, args.speed, args.concurrency, args.timeout)
+    sessions = len(group_sessions(records))
+    print(f"Replaying {len(records)} requests in {sessions} sessions against {args.url}...")
+    duration = replayer.run(records)
+    run = {
+        "label": args.label or args.url,
+        "url": args.url,
+        "speed": args.speed,
+        "traces": args.traces,
+        "trace_records": len(records),
+        "duration_s": duration,
+        "results": replayer.results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(run, f)
+        print(f"Saved results to {args.out}")
+    print_summary(run)
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        a = json.load(f)
+    with open(args.candidate) as f:
+        b = json.load(f)
+    print_comparison(a, b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded BMO chat traces and compare server builds")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = commands.add_parser("replay", help="Re-drive a server from trace files")
+    replay_parser.add_argument("traces", nargs="+", help="Trace files (.jsonl.gz), e.g. one per worker")
+    replay_parser.add_argument("--url", default="http://localhost:8000")
+    replay_parser.add_argument("--speed", type=float, default=1.0,
+                               help="1 = recorded pace, N = N times faster, 0 = as fast as possible")
+    replay_parser.add_argument("--concurrency", type=int, default=64, help="Max requests in flight")
+    replay_parser.add_argument("--limit", type=int, default=None, help="Replay only the first N requests")
+    replay_parser.add_argument("--timeout", type=float, default=600.0, help="Per-request timeout (s)")
+    replay_parser.add_argument("--label", default=None, help="Name for this build in reports")
+    replay_parser.add_argument("--out", default=None, help="Save results here for `compare`")
+    replay_parser.set_defaults(func=replay)
+
+    compare_parser = commands.add_parser("compare", help="Latency/throughput report for two replay results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import uvicorn
+import argparse
 import logging
 import sys
 import os
@@ -60,7 +61,22 @@ def print_bmo_banner():
     """
     print(banner)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Start the BMO chat server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("BMO_WORKERS", "1")),
+        help="Model worker processes behind a session-affine dispatcher (workers use ports PORT+1..PORT+N)"
+    )
+    parser.add_argument(
+        "--threads", type=int, default=None,
+        help="llama.cpp threads per worker (default: CPU cores / workers)"
+    )
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
     print_bmo_banner()
     
     logger.info("Starting BMO server...")
@@ -72,14 +88,25 @@ if __name__ == "__main__":
     
     try:
         logger.info("BMO is waking up...")
-        logger.info("Server will be available at: http://localhost:8000")
-        logger.info("API docs at: http://localhost:8000/docs")
-        logger.info("Chat endpoint: http://localhost:8000/chat/")
+        logger.info(f"Server will be available at: http://localhost:{args.port}")
+        logger.info(f"API docs at: http://localhost:{args.port}/docs")
+        logger.info(f"Chat endpoint: http://localhost:{args.port}/chat/")
+        
+        if args.workers > 1:
+            from app.dispatcher import create_app
+            
+            logger.info(f"Running {args.workers} BMO workers on ports {args.port + 1}-{args.port + args.workers}")
+            logger.info("Workers share the mmapped model; each adds only its own context memory")
+            app = create_app(args.workers, base_port=args.port + 1, threads=args.threads)
+        else:
+            if args.threads:
+                os.environ["BMO_THREADS"] = str(args.threads)
+            app = "app.main:app"
         
         uvicorn.run(
-            "app.main:app",
-            host="0.0.0.0",
-            port=8000,
+            app,
+            host=args.host,
+            port=args.port,
             reload=False,  # Disable reload for better performance with large models
             log_level="info",
             access_log=True
@@ -0,0 +1,90 @@
+"""
+Checks that concurrent chats queue on the model lock rather than on the
+event loop, so the trace's queue_ms shows the wait. llama_cpp is replaced
+by a slow stand-in; no model file is loaded.
+
+    python -m pytest -q test_chat_queueing.py
+"""
+import asyncio
+import gzip
+import json
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+GENERATE_SECONDS = 0.3
+
+
+class FakeLlama:
+    started = threading.Event()
+
+    def __init__(self, model_path, **settings):
+        pass
+
+    def set_cache(self, cache):
+        pass
+
+    def __call__(self, prompt, **kwargs):
+        FakeLlama.started.set()
+        time.sleep(GENERATE_SECONDS)
+        return {"choices": [{"text": "Beep boop, a story!"}], "usage": {"completion_tokens": 4}}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    fake = types.ModuleType("llama_cpp")
+    fake.Llama = FakeLlama
+    fake.LlamaRAMCache = object
+    monkeypatch.setitem(sys.modules, "llama_cpp", fake)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "mistral-model.gguf").write_bytes(b"\0")
+    monkeypatch.setenv("BMO_TRACE_PATH", str(tmp_path / "trace.jsonl.gz"))
+
+    import httpx
+    from app.main import app
+    from app.services import chat_service, trace_recorder
+
+    # chat_service may already be imported with another test's stand-in
+    monkeypatch.setattr(chat_service, "Llama", FakeLlama)
+    monkeypatch.setattr(chat_service, "_llm_service", None)
+    monkeypatch.setattr(trace_recorder, "_recorder", None)
+    monkeypatch.setattr(trace_recorder, "_recorder_checked", False)
+    chat_service.get_llm_service()
+    FakeLlama.started.clear()
+    yield httpx.AsyncClient(app=app, base_url="http://bmo")
+    trace_recorder.get_trace_recorder().close()
+
+
+def read_trace(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_overlapping_chat_records_queue_time(client, tmp_path):
+    from app.services import trace_recorder
+
+    payload = {"prompt": "Tell me a story about Finn and Jake.", "max_tokens": 20}
+
+    async def second_chat():
+        # Sent once the first is generating; a handler blocking the event loop
+        # would hold this back until the first finished, hiding the wait
+        await asyncio.get_running_loop().run_in_executor(None, FakeLlama.started.wait, 5)
+        return await client.post("/chat/", json=payload)
+
+    async def overlap():
+        async with client:
+            return await asyncio.gather(client.post("/chat/", json=payload), second_chat())
+
+    responses = asyncio.run(overlap())
+    trace_recorder.get_trace_recorder().close()
+
+    assert [r.status_code for r in responses] == [200, 200]
+    records = read_trace(tmp_path / "trace.jsonl.gz")
+    assert len(records) == 2
+    # The second request arrives mid-generation and waits for most of it
+    assert max(r["queue_ms"] for r in records) > GENERATE_SECONDS * 1000 / 3
+    assert all(r["total_ms"] >= r["queue_ms"] for r in records)
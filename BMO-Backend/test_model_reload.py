@@ -0,0 +1,68 @@
+"""
+Checks that /chat/admin/reload only loads .gguf files from models/.
+llama_cpp is replaced by a stand-in; no model file is loaded.
+
+    python -m pytest -q test_model_reload.py
+"""
+import sys
+import types
+
+import pytest
+
+
+class FakeLlama:
+    def __init__(self, model_path, **settings):
+        pass
+
+    def set_cache(self, cache):
+        pass
+
+    def __call__(self, prompt, **kwargs):
+        return {"choices": [{"text": "Beep boop!"}], "usage": {"completion_tokens": 2}}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    fake = types.ModuleType("llama_cpp")
+    fake.Llama = FakeLlama
+    fake.LlamaRAMCache = object
+    monkeypatch.setitem(sys.modules, "llama_cpp", fake)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "mistral-model.gguf").write_bytes(b"\0")
+    (tmp_path / "secret.gguf").write_bytes(b"\0")
+    monkeypatch.delenv("BMO_TRACE_PATH", raising=False)
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services import chat_service
+
+    # chat_service may already be imported with another test's stand-in
+    monkeypatch.setattr(chat_service, "Llama", FakeLlama)
+    monkeypatch.setattr(chat_service, "_llm_service", None)
+    service = chat_service.get_llm_service()
+    yield TestClient(app)
+    if service._reload_thread is not None:
+        service._reload_thread.join(5)
+
+
+@pytest.mark.parametrize("model_path", [
+    "/etc/passwd",
+    "../secret.gguf",
+    "models/../secret.gguf",
+    "models/notes.txt",
+])
+def test_reload_refuses_paths_outside_models(client, model_path):
+    response = client.post("/chat/admin/reload", json={"model_path": model_path})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("model_path", ["mistral-model.gguf", "models/mistral-model.gguf"])
+def test_reload_accepts_models_by_name_or_path(client, model_path):
+    response = client.post("/chat/admin/reload", json={"model_path": model_path})
+    assert response.status_code == 202
+    assert response.json()["model_path"] == "models/mistral-model.gguf"
+
+
+def test_reload_missing_model_is_404(client):
+    assert client.post("/chat/admin/reload", json={"model_path": "missing.gguf"}).status_code == 404
@@ -5,9 +5,14 @@ llm = Llama(
     n_ctx=2048,
 )
 
-def get_response(user_input: str) -> str:
+FALLBACK_REPLY = "Sorry, I didn't catch that. Could you repeat the question?"
+
+def build_prompt(user_input: str) -> str:
     # Use the chat format expected by Mistral
-    prompt = f"<s>[INST] {user_input.strip()} [/INST]"
+    return f"<s>[INST] {user_input.strip()} [/INST]"
+
+def get_response(user_input: str) -> str:
+    prompt = build_prompt(user_input)
 
     try:
         result = llm(prompt, max_tokens=100, stop=["</s>"])
@@ -15,10 +20,27 @@ def get_response(user_input: str) -> str:
 
         # Avoid weird empty responses
         if not output or output.lower() in ["please?", "uh...", ""]:
-            return "Sorry, I didn't catch that. Could you repeat the question?"
+            return FALLBACK_REPLY
         
         return output
 
     except Exception as e:
         print(f"❌ LLM error: {e}")
         return "There was an error generating a response."
+
+def stream_response(user_input: str):
+    """Yield the reply piece by piece as the model generates it."""
+    produced = False
+    try:
+        for chunk in llm(build_prompt(user_input), max_tokens=100, stop=["</s>"], stream=True):
+            text = chunk["choices"][0]["text"]
+            if text:
+                produced = produced or bool(text.strip())
+                yield text
+    except Exception as e:
+        print(f"❌ LLM error: {e}")
+        yield " There was an error generating a response."
+        return
+
+    if not produced:
+        yield FALLBACK_REPLY
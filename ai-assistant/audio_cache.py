@@ -0,0 +1,150 @@
+# Generated from shared/audio_cache.py by shared/sync.py -- edit that file, not this copy.
+import hashlib
+import os
+import threading
+import wave
+from collections import OrderedDict
+import numpy as np
+
+
+def normalize_text(text):
+    return " ".join(text.lower().split())
+
+
+class AudioCache:
+    """
+    Content-addressed cache of synthesized speech. Entries are keyed by the
+    normalized text plus the voice and rate, kept hot in memory (LRU) and
+    stored as WAV files in a size-capped on-disk LRU.
+    """
+
+    def __init__(self, cache_dir=os.path.join("cache", "tts"), max_disk_mb=50, max_memory_entries=64):
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_mb * 1024 * 1024
+        self.max_memory_entries = max_memory_entries
+        self.memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.disk = {}
+        for name in os.listdir(cache_dir):
+            if name.endswith(".wav"):
+                path = os.path.join(cache_dir, name)
+                self.disk[name[:-4]] = (os.path.getmtime(path), os.path.getsize(path))
+
+    @staticmethod
+    def key(text, voice, rate):
+        raw = f"{voice}|{rate}|{normalize_text(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def _touch(self, key):
+        """Mark a disk entry as used, so phrases served from memory aren't evicted (or lost on restart) as stale."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+            self.disk[key] = (os.path.getmtime(path), self.disk[key][1])
+        except OSError:
+            self.disk.pop(key, None)
+
+    def get(self, text, voice, rate):
+        """Return (audio, sample_rate) or None. Audio is int16 shaped (frames, channels)."""
+        key = self.key(text, voice, rate)
+        with self._lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                if key in self.disk:
+                    self._touch(key)
+                return self.memory[key]
+            if key not in self.disk:
+                self.misses += 1
+                return None
+
+        path = self._path(key)
+        try:
+            with wave.open(path, "rb") as wav:
+                sample_rate = wav.getframerate()
+                channels = wav.getnchannels()
+                audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16).reshape(-1, channels)
+            os.utime(path)
+        except (OSError, wave.Error, ValueError):
+            with self._lock:
+                self.disk.pop(key, None)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk[key] = (os.path.getmtime(path), os.path.getsize(path))
+            self._remember(key, (audio, sample_rate))
+            self.disk_hits += 1
+        return audio, sample_rate
+
+    def put(self, text, voice, rate, audio, sample_rate):
+        key = self.key(text, voice, rate)
+        audio = np.asarray(audio, dtype=np.int16)
+        if audio.ndim == 1:
+            audio = audio.reshape(-1, 1)
+
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        with wave.open(tmp_path, "wb") as wav:
+            wav.setnchannels(audio.shape[1])
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(audio.tobytes())
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.disk[key] = (os.path.getmtime(path), os.path.getsize(path))
+            self._remember(key, (audio, sample_rate))
+            self._evict()
+
+    def _evict(self):
+        total = sum(size for _, size in self.disk.values())
+        for key, (_, size) in sorted(self.disk.items(), key=lambda item: item[1][0]):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            del self.disk[key]
+            total -= size
+
+    def get_or_synthesize(self, text, voice, rate, synthesize):
+        """Look text up, calling synthesize(text) -> (audio, sample_rate) on a miss."""
+        cached = self.get(text, voice, rate)
+        if cached is not None:
+            return cached
+        result = synthesize(text)
+        if result is not None:
+            self.put(text, voice, rate, *result)
+        return result
+
+    def prewarm(self, phrases, voice, rate, synthesize):
+        """Load (or synthesize) common phrases so they play without any TTS work."""
+        for phrase in phrases:
+            self.get_or_synthesize(phrase, voice, rate, synthesize)
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "disk_entries": len(self.disk),
+            "disk_bytes": sum(size for _, size in self.disk.values()),
+        }
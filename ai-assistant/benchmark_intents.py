@@ -0,0 +1,63 @@
+import random
+import time
+from intents import IntentEngine, tokenize
+
+UTTERANCES = [
+    "hey can you set a timer for five minutes",
+    "please open the calculator for me",
+    "what is the weather like tomorrow morning",
+    "cancel the alarm i set earlier",
+]
+
+
+def synthetic_phrases(rng, count):
+    """count intents with 3 made-up trigger phrases of 1-3 words each."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(count * 2)]
+    return [[" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(3)] for _ in range(count)]
+
+
+def linear_match(intents, text):
+    """The old approach: test every phrase of every intent against the text."""
+    found = []
+    padded = f" {' '.join(tokenize(text))} "
+    for name, phrases in intents:
+        for phrase in phrases:
+            if f" {phrase} " in padded:
+                found.append(name)
+                break
+    return found
+
+
+def time_per_call(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in UTTERANCES:
+            fn(text)
+    return (time.perf_counter() - start) / (rounds * len(UTTERANCES)) * 1e6
+
+
+def main(rounds=2000):
+    rng = random.Random(0)
+    print("Intent matching: compiled automaton vs. linear scan (µs per utterance)")
+    print("=" * 60)
+    print(f"{'intents':>8} {'compile ms':>11} {'automaton':>10} {'linear':>10}")
+
+    for count in (10, 50, 100, 250, 500, 1000):
+        intents = [("timer", ["set a timer", "timer"]), ("calculator", ["open calculator"])]
+        intents += [(f"intent_{i}", phrases) for i, phrases in enumerate(synthetic_phrases(rng, count - len(intents)))]
+
+        engine = IntentEngine()
+        for name, phrases in intents:
+            engine.register(name, phrases)
+        start = time.perf_counter()
+        engine.compile()
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        automaton_us = time_per_call(engine.match, rounds)
+        linear_us = time_per_call(lambda text: linear_match(intents, text), rounds)
+        print(f"{count:>8} {compile_ms:>11.1f} {automaton_us:>10.1f} {linear_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import time
+import wave
+import numpy as np
+import sounddevice as sd
+from text_to_speech import PiperTTS, synthesize_wav
+
+PHRASES = [
+    "Command executed.",
+    "Sorry, I didn't catch that. Could you repeat the question?",
+    "The weather today looks sunny with a light breeze, perfect for a walk in the park.",
+]
+
+
+def time_wav_path(text):
+    """Old path: fresh Piper process -> output.wav -> load and start playback."""
+    start = time.perf_counter()
+    if not synthesize_wav(text, "output.wav"):
+        return None
+    with wave.open("output.wav", "rb") as wav:
+        rate = wav.getframerate()
+        audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    sd.play(audio, rate)
+    latency = time.perf_counter() - start
+    sd.wait()
+    return latency
+
+
+def main(rounds=3):
+    print("Text-to-first-audio benchmark")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    tts = PiperTTS()
+    print(f"Streaming worker startup (paid once): {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+    wav_times, stream_times = [], []
+    for text in PHRASES:
+        for _ in range(rounds):
+            latency = time_wav_path(text)
+            if latency is not None:
+                wav_times.append(latency)
+            tts.speak(text)
+            stream_times.append(tts.first_audio_latencies[-1])
+        print(f"{text[:40]:<42} wav: {np.mean(wav_times[-rounds:]) * 1000:7.0f} ms   "
+              f"stream: {np.mean(stream_times[-rounds:]) * 1000:7.0f} ms")
+
+    tts.close()
+    print("-" * 50)
+    print(f"Mean time to first audio - wav file: {np.mean(wav_times) * 1000:.0f} ms, "
+          f"streaming worker: {np.mean(stream_times) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
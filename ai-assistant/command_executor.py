@@ -1,11 +1,10 @@
 import os
+from intents import IntentEngine
+
+commands = IntentEngine()
+commands.register("notepad", ["open notepad"], lambda text: os.system("start notepad"))
+commands.register("calculator", ["open calculator"], lambda text: os.system("start calc"))
 
 def execute_command(text: str) -> bool:
-    text = text.lower()
-    if "open notepad" in text:
-        os.system("start notepad")
-        return True
-    elif "open calculator" in text:
-        os.system("start calc")
-        return True
-    return False
+    match, _ = commands.handle(text)
+    return match is not None
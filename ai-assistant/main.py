@@ -1,24 +1,32 @@
-from speech_to_text import recognize_speech
-from assistant import get_response
-from text_to_speech import speak
+from speech_to_text import get_recognizer
+from text_to_speech import get_tts
 from command_executor import execute_command
+from pipeline import speak_streaming, LatencyTracker
 
 def main():
+    recognizer = get_recognizer()
+    tts = get_tts()
+    latency = LatencyTracker()
+    barge_in = None
     while True:
         try:
-            user_input = recognize_speech()
+            # After a barge-in, pick up the new utterance from where it started
+            user_input = recognizer.listen(start_pos=barge_in)
+            barge_in = None
             if not user_input:
                 continue
+            tts.interrupted.clear()
 
             print(f"🧠 You said: {user_input}")
 
             if execute_command(user_input):
-                speak("Command executed.")
-                continue
+                tts.speak("Command executed.")
+            else:
+                # Sentences are spoken as soon as they're generated
+                reply, barge_in = speak_streaming(user_input, tts, recognizer.capture)
+                print(f"🤖 AI: {reply}")
 
-            reply = get_response(user_input)
-            print(f"🤖 AI: {reply}")
-            speak(reply)
+            latency.record(recognizer.capture.last_speech_end, tts.last_audio_start)
 
         except KeyboardInterrupt:
             print("\n👋 Exiting...")
@@ -26,5 +34,13 @@ def main():
         except Exception as e:
             print(f"❌ Error: {e}")
 
+    stats = recognizer.stats()
+    print(f"📊 STT: {stats['utterances']} utterances, avg decode {stats['avg_decode_ms']:.0f} ms, "
+          f"avg result {stats['avg_final_ms']:.0f} ms (model loaded once in {stats['load_time_s']:.2f}s), "
+          f"{stats['capture']['silence_dropped']:.0%} of audio skipped as silence")
+    print(f"📊 End-to-end: {latency.summary()}")
+    recognizer.close()
+    tts.close()
+
 if __name__ == "__main__":
     main()
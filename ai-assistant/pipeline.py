@@ -0,0 +1,122 @@
+import queue
+import re
+import threading
+from assistant import stream_response
+
+SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+CLAUSE_END = re.compile(r"[,;:]\s+")
+
+
+class SentenceSplitter:
+    """Turns a stream of LLM tokens into speakable sentences."""
+
+    def __init__(self, min_chars=12, max_chars=160):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.buffer = ""
+
+    def feed(self, text):
+        self.buffer += text
+        sentences = []
+        while True:
+            match = SENTENCE_END.search(self.buffer, self.min_chars)
+            # Very long sentences get cut at a comma so speech can start sooner
+            if match is None and len(self.buffer) > self.max_chars:
+                match = CLAUSE_END.search(self.buffer, self.min_chars)
+            if match is None:
+                return sentences
+            sentence = self.buffer[:match.end()].strip()
+            self.buffer = self.buffer[match.end():]
+            if sentence:
+                sentences.append(sentence)
+
+    def flush(self):
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return rest
+
+
+def speak_streaming(user_input, tts, capture=None):
+    """
+    Speak the reply sentence by sentence while the LLM keeps generating.
+    If a capture is given, the user talking over BMO stops speech and
+    generation (barge-in). Returns the reply text and the sample position
+    where the user started talking, or None if they didn't interrupt.
+    """
+    sentences = queue.Queue()
+    reply = []
+    cancel = threading.Event()
+    barge_in = []
+    tts.interrupted.clear()
+
+    def produce():
+        splitter = SentenceSplitter()
+        tokens = stream_response(user_input)
+        try:
+            for token in tokens:
+                if cancel.is_set():
+                    break
+                reply.append(token)
+                for sentence in splitter.feed(token):
+                    sentences.put(sentence)
+            tail = splitter.flush()
+            if tail and not cancel.is_set():
+                sentences.put(tail)
+        finally:
+            tokens.close()
+            sentences.put(None)
+
+    def watch():
+        onset = capture.wait_for_onset(stop_event=cancel)
+        if onset is not None and not cancel.is_set():
+            barge_in.append(onset)
+            cancel.set()
+            tts.stop()
+            print("✋ Barge-in: BMO stops talking")
+
+    threading.Thread(target=produce, daemon=True).start()
+    watcher = None
+    if capture is not None:
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+
+    try:
+        while True:
+            sentence = sentences.get()
+            if sentence is None:
+                break
+            if not cancel.is_set():
+                tts.speak(sentence)
+        # speak() returns once the audio is handed to the device; the user can
+        # still talk over the last of it, so keep watching until it has played
+        if not cancel.is_set():
+            tts.wait_until_played()
+    finally:
+        cancel.set()
+        if watcher is not None:
+            watcher.join()
+
+    return "".join(reply).strip(), barge_in[0] if barge_in else None
+
+
+class LatencyTracker:
+    """Tracks the 'user stops talking -> BMO starts talking' delay per turn."""
+
+    def __init__(self):
+        self.samples = []
+
+    def record(self, speech_end, audio_start):
+        if speech_end is None or audio_start is None or audio_start < speech_end:
+            return None
+        latency = audio_start - speech_end
+        self.samples.append(latency)
+        print(f"⏱️ You stopped talking → BMO started talking: {latency * 1000:.0f} ms")
+        return latency
+
+    def summary(self):
+        if not self.samples:
+            return "no turns measured"
+        ordered = sorted(self.samples)
+        mean = sum(ordered) / len(ordered)
+        p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+        return f"{len(ordered)} turns, mean {mean * 1000:.0f} ms, p90 {p90 * 1000:.0f} ms"
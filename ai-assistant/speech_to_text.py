@@ -1,30 +1,86 @@
-import sounddevice as sd
-import queue
 import vosk
 import json
 import os
+import time
+from audio_capture import AudioCapture
 
 MODEL_PATH = "models/vosk-model"
+SAMPLE_RATE = 16000
 
-q = queue.Queue()
 
-def callback(indata, frames, time, status):
-    if status:
-        print(status)
-    q.put(bytes(indata))
+class SpeechRecognizer:
+    """Loads the Vosk model and opens the microphone once, then reuses them for every utterance."""
 
-def recognize_speech():
-    if not os.path.exists(MODEL_PATH):
-        raise FileNotFoundError("Vosk model not found.")
-    model = vosk.Model(MODEL_PATH)
-    samplerate = 16000
-
-    with sd.RawInputStream(samplerate=samplerate, blocksize=8000, dtype='int16',
-                           channels=1, callback=callback):
-        rec = vosk.KaldiRecognizer(model, samplerate)
+    def __init__(self, model_path=MODEL_PATH, samplerate=SAMPLE_RATE):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError("Vosk model not found.")
+
+        start = time.perf_counter()
+        self.model = vosk.Model(model_path)
+        self.samplerate = samplerate
+        self.rec = vosk.KaldiRecognizer(self.model, samplerate)
+        self.capture = AudioCapture(samplerate=samplerate)
+        self.capture.start()
+        self.load_time = time.perf_counter() - start
+        print(f"🎙️ Speech recognizer ready in {self.load_time:.2f}s")
+
+        self.utterances = 0
+        self.total_decode_time = 0.0
+        self.total_final_time = 0.0
+        self.last_latency = None
+
+    def listen(self, start_pos=None):
+        self.rec.Reset()
         print("🎤 Listening...")
-        while True:
-            data = q.get()
-            if rec.AcceptWaveform(data):
-                result = json.loads(rec.Result())
-                return result.get("text", "")
+
+        # Only voiced audio (plus pre-roll) reaches Kaldi; silence and audio
+        # from before this call (e.g. our own TTS) never get decoded.
+        decode_time = 0.0
+        parts = []
+        for chunk in self.capture.utterance(start_pos=start_pos):
+            start = time.perf_counter()
+            if self.rec.AcceptWaveform(chunk):
+                parts.append(json.loads(self.rec.Result()).get("text", ""))
+            decode_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        parts.append(json.loads(self.rec.FinalResult()).get("text", ""))
+        final_time = time.perf_counter() - start
+        decode_time += final_time
+        self._record_latency(decode_time, final_time)
+        return " ".join(p for p in parts if p)
+
+    def _record_latency(self, decode_time, final_time):
+        self.utterances += 1
+        self.total_decode_time += decode_time
+        self.total_final_time += final_time
+        self.last_latency = {"decode_ms": decode_time * 1000, "final_ms": final_time * 1000}
+        print(f"⏱️ STT: decode {decode_time * 1000:.0f} ms, result {final_time * 1000:.0f} ms after end of speech")
+
+    def stats(self):
+        n = self.utterances or 1
+        return {
+            "utterances": self.utterances,
+            "load_time_s": self.load_time,
+            "avg_decode_ms": self.total_decode_time / n * 1000,
+            "avg_final_ms": self.total_final_time / n * 1000,
+            "last": self.last_latency,
+            "capture": self.capture.stats(),
+        }
+
+    def close(self):
+        self.capture.close()
+
+
+_recognizer = None
+
+
+def get_recognizer():
+    global _recognizer
+    if _recognizer is None:
+        _recognizer = SpeechRecognizer()
+    return _recognizer
+
+
+def recognize_speech():
+    return get_recognizer().listen()
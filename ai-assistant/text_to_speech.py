@@ -1,20 +1,245 @@
 import subprocess
+import threading
+import json
 import os
+import re
+import time
+import numpy as np
+import sounddevice as sd
+from audio_cache import AudioCache
+
+PIPER_PATH = os.path.abspath(os.path.join("piper", "piper.exe"))
+MODEL_PATH = os.path.abspath(os.path.join("models", "en_US-lessac-medium.onnx"))
+
+# Piper logs this after every line once all of its raw audio has been written
+RTF_PATTERN = re.compile(r"Real-time factor: .*audio=([0-9.eE+-]+) sec")
+
+# Until Piper has logged one of those lines (a build that logs differently
+# never will), an utterance counts as finished after this much silence
+IDLE_END_SECONDS = 2.0
+
+PREWARM_PHRASES = [
+    "Command executed.",
+    "Sorry, I didn't catch that. Could you repeat the question?",
+    "There was an error generating a response.",
+]
+
+
+class PiperTTS:
+    """
+    Keeps one Piper process with the voice loaded and streams its raw PCM
+    output straight to the audio device, one line of text per utterance.
+    """
+
+    def __init__(self, piper_path=PIPER_PATH, model_path=MODEL_PATH, chunk_size=2048, cache=None):
+        with open(model_path + ".json", encoding="utf-8") as f:
+            self.sample_rate = json.load(f)["audio"]["sample_rate"]
+        self.chunk_size = chunk_size
+        self.voice = os.path.basename(model_path)
+        self.rate = 1.0
+        self.cache = cache
+
+        self.process = subprocess.Popen(
+            [piper_path, "--model", model_path, "--output_raw"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0
+        )
+        self.stream = sd.RawOutputStream(samplerate=self.sample_rate, channels=1, dtype='int16',
+                                         latency='low')
+        self.stream.start()
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._bytes_played = 0
+        self._expected_bytes = None
+        self._rtf_seen = False
+        self._last_chunk_at = None
+        self._eof = False
+        self._write_error = None
+        self._played_until = 0.0
+        self._sent_at = None
+        self._play = True
+        self._captured = []
+        self.first_audio_latencies = []
+        self.last_audio_start = None
+        self.interrupted = threading.Event()
+
+        threading.Thread(target=self._pump_audio, daemon=True).start()
+        threading.Thread(target=self._watch_log, daemon=True).start()
+
+    def _pump_audio(self):
+        pending = b""
+        while True:
+            data = self.process.stdout.read(self.chunk_size)
+            if not data:
+                break
+            # An unbuffered pipe can split a sample; hold its first byte for the next read
+            chunk = pending + data
+            cut = len(chunk) - len(chunk) % 2
+            chunk, pending = chunk[:cut], chunk[cut:]
+            if not chunk:
+                continue
+            if self._play and not self.interrupted.is_set() and self._write_error is None:
+                try:
+                    self._write(chunk)
+                except Exception as e:
+                    # Keep draining Piper so it doesn't block; _run reports the failure
+                    print(f"❌ TTS playback failed: {e}")
+                    self._write_error = e
+            with self._cond:
+                self._captured.append(chunk)
+                self._last_chunk_at = time.perf_counter()
+                if self._bytes_played == 0 and self._sent_at is not None and self._play:
+                    self.last_audio_start = time.perf_counter()
+                    latency = self.last_audio_start - self._sent_at
+                    self.first_audio_latencies.append(latency)
+                    print(f"⏱️ TTS: first audio after {latency * 1000:.0f} ms")
+                self._bytes_played += len(chunk)
+                self._cond.notify_all()
+        with self._cond:
+            self._eof = True
+            self._cond.notify_all()
+
+    def _write(self, pcm):
+        """Hand PCM to the device, noting when it will have finished playing."""
+        self.stream.write(pcm)
+        # write() blocks while the device buffer is full, so this tracks real playback closely
+        now = time.perf_counter()
+        self._played_until = max(self._played_until, now) + len(pcm) / 2 / self.sample_rate
+
+    def wait_until_played(self, timeout=None):
+        """Block until the audio handed to the device has played out, or speech is interrupted."""
+        remaining = self._played_until + self.stream.latency - time.perf_counter()
+        if timeout is not None:
+            remaining = min(remaining, timeout)
+        if remaining > 0:
+            self.interrupted.wait(remaining)
+
+    def _watch_log(self):
+        for line in iter(self.process.stderr.readline, b""):
+            match = RTF_PATTERN.search(line.decode(errors="replace"))
+            if match:
+                samples = round(float(match.group(1)) * self.sample_rate)
+                with self._cond:
+                    self._expected_bytes = samples * 2
+                    self._rtf_seen = True
+                    self._cond.notify_all()
+
+    def _finished(self):
+        """Whether the current utterance is over; call with self._cond held."""
+        if self._eof or self._write_error is not None:
+            return True
+        if self._expected_bytes is not None:
+            return self._bytes_played >= self._expected_bytes
+        if self._rtf_seen or not self._bytes_played:
+            return False
+        return time.perf_counter() - self._last_chunk_at >= IDLE_END_SECONDS
+
+    def _run(self, text, play=True, timeout=60.0):
+        """Send one line to Piper and return its PCM, playing it as it arrives if asked."""
+        with self._cond:
+            self._bytes_played = 0
+            self._expected_bytes = None
+            self._last_chunk_at = None
+            self._write_error = None
+            self._captured = []
+            self._play = play
+            self._sent_at = time.perf_counter()
+        self.process.stdin.write((text + "\n").encode("utf-8"))
+        self.process.stdin.flush()
+
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            # Short waits so the silence fallback is checked while no audio arrives
+            while not self._finished() and time.perf_counter() < deadline:
+                self._cond.wait(min(0.25, max(0.0, deadline - time.perf_counter())))
+            done = self._finished()
+            pcm = b"".join(self._captured)
+            failed = self._write_error is not None or (self._eof and not pcm)
+        if not done or failed:
+            print("❌ Piper failed.")
+            return None
+        return pcm
+
+    def synthesize(self, text: str):
+        """Synthesize without playing, returning (audio, sample_rate) for the cache."""
+        with self._lock:
+            pcm = self._run(" ".join(text.split()), play=False)
+        if pcm is None:
+            return None
+        return np.frombuffer(pcm, dtype=np.int16), self.sample_rate
+
+    def prewarm(self, phrases=PREWARM_PHRASES):
+        if self.cache is not None:
+            self.cache.prewarm(phrases, self.voice, self.rate, self.synthesize)
+
+    def speak(self, text: str, timeout: float = 60.0):
+        """Synthesize and play text, returning once the audio has been handed to the device."""
+        # Piper treats every line as a separate utterance
+        text = " ".join(text.split())
+        if not text:
+            return
+        print(f"🗣️ Speaking: {text}")
+
+        with self._lock:
+            if self.interrupted.is_set():
+                return
+
+            cached = self.cache.get(text, self.voice, self.rate) if self.cache else None
+            if cached is not None:
+                start = time.perf_counter()
+                pcm = cached[0].tobytes()
+                # Small writes so a barge-in can cut playback off quickly
+                for offset in range(0, len(pcm), self.chunk_size):
+                    if self.interrupted.is_set():
+                        break
+                    self._write(pcm[offset:offset + self.chunk_size])
+                    if offset == 0:
+                        self.last_audio_start = time.perf_counter()
+                        self.first_audio_latencies.append(self.last_audio_start - start)
+                return
+
+            pcm = self._run(text, play=True, timeout=timeout)
+            if pcm and self.cache is not None:
+                self.cache.put(text, self.voice, self.rate, np.frombuffer(pcm, dtype=np.int16), self.sample_rate)
+
+    def stop(self):
+        """Cut off speech now; anything Piper is still producing is discarded."""
+        self.interrupted.set()
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        self.stream.stop()
+        self.stream.close()
+
+
+_tts = None
+
+
+def get_tts():
+    global _tts
+    if _tts is None:
+        _tts = PiperTTS(cache=AudioCache())
+        _tts.prewarm()
+    return _tts
+
 
 def speak(text: str):
-    print(f"🗣️ Speaking: {text}")
-    output_path = "output.wav"
+    get_tts().speak(text)
+
 
+def synthesize_wav(text: str, output_path: str = "output.wav") -> bool:
+    """One-shot Piper run that writes a WAV file (the old per-reply path)."""
     if os.path.exists(output_path):
         os.remove(output_path)
 
-    # Absolute path to piper.exe
-    piper_path = os.path.abspath(os.path.join("piper", "piper.exe"))
-    model_path = os.path.abspath(os.path.join("models", "en_US-lessac-medium.onnx"))
-
     # Run Piper without shell=True, and pass text via stdin
     process = subprocess.Popen(
-        [piper_path, "--model", model_path, "--output_file", output_path],
+        [PIPER_PATH, "--model", MODEL_PATH, "--output_file", output_path],
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
@@ -26,7 +251,5 @@ def speak(text: str):
     if process.returncode != 0:
         print("❌ Piper failed.")
         print(stderr)
-        return
-
-    # Use 'start' to play wav in PowerShell with shell=True
-    subprocess.run(["start", output_path], shell=True)
+        return False
+    return True
@@ -0,0 +1,185 @@
+"""
+Offline batch transcription and STT benchmark.
+
+Runs the Vosk recognizer over every .wav file in a directory using a pool
+of worker processes (each loads the model once) and reports the transcript,
+word error rate and real-time factor per file and overall. If `clip.txt`
+sits next to `clip.wav` it is used as the reference transcript; an empty
+one marks a clip with no speech, where every recognized word is an error.
+
+    python transcribe_batch.py recordings/ --model models/vosk-model --workers 4
+
+Pass --grammar with a JSON list of phrases to benchmark grammar-constrained
+(command mode) decoding against open dictation.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import time
+import wave
+from multiprocessing import Pool, cpu_count
+
+MODEL_PATH = "models/vosk-model"
+
+_model = None
+
+
+def _init_worker(model_path):
+    global _model
+    import vosk
+    vosk.SetLogLevel(-1)
+    _model = vosk.Model(model_path)
+
+
+def transcribe_file(job):
+    path, block_size, grammar = job
+    import vosk
+
+    try:
+        wav = wave.open(path, "rb")
+    except (OSError, wave.Error) as e:
+        return {"file": path, "error": str(e)}
+    with wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            return {"file": path, "error": "expected mono 16-bit PCM"}
+        sample_rate = wav.getframerate()
+        duration = wav.getnframes() / sample_rate
+
+        start = time.perf_counter()
+        if grammar:
+            rec = vosk.KaldiRecognizer(_model, sample_rate, grammar)
+        else:
+            rec = vosk.KaldiRecognizer(_model, sample_rate)
+        parts = []
+        while True:
+            data = wav.readframes(block_size)
+            if not data:
+                break
+            if rec.AcceptWaveform(data):
+                parts.append(json.loads(rec.Result()).get("text", ""))
+        parts.append(json.loads(rec.FinalResult()).get("text", ""))
+        decode_time = time.perf_counter() - start
+
+    return {
+        "file": path,
+        "transcript": " ".join(p for p in parts if p),
+        "duration_s": duration,
+        "decode_s": decode_time,
+        "rtf": decode_time / duration if duration else 0.0,
+    }
+
+
+def normalize_words(text):
+    return re.sub(r"[^a-z0-9' ]", " ", text.lower()).split()
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance between two transcripts: (errors, reference word count)."""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    row = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, hyp_word in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(
+                row[j] + 1,                        # deletion
+                row[j - 1] + 1,                    # insertion
+                prev + (ref_word != hyp_word),     # substitution
+            )
+    return row[len(hyp)], len(ref)
+
+
+def load_reference(wav_path):
+    ref_path = os.path.splitext(wav_path)[0] + ".txt"
+    if not os.path.exists(ref_path):
+        return None
+    with open(ref_path, encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-transcribe WAV files with Vosk and measure WER / RTF")
+    parser.add_argument("directory", help="Directory containing .wav files (and optional .txt references)")
+    parser.add_argument("--model", default=MODEL_PATH, help="Path to the Vosk model")
+    parser.add_argument("--workers", type=int, default=cpu_count(), help="Worker processes, one model each")
+    parser.add_argument("--block-size", type=int, default=8000, help="Frames fed to the recognizer per call")
+    parser.add_argument("--grammar", help="JSON file with a list of phrases to restrict recognition to")
+    parser.add_argument("--output", help="Write per-file results as JSON lines to this file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        raise SystemExit(f"Vosk model not found: {args.model}")
+    files = sorted(glob.glob(os.path.join(args.directory, "**", "*.wav"), recursive=True))
+    if not files:
+        raise SystemExit(f"No .wav files found in {args.directory}")
+
+    grammar = None
+    if args.grammar:
+        with open(args.grammar, encoding="utf-8") as f:
+            grammar = json.dumps(json.load(f))
+
+    print(f"Transcribing {len(files)} files with {args.workers} workers ({args.model})")
+    print("=" * 70)
+
+    results = []
+    total_audio = total_decode = 0.0
+    total_errors = total_ref_words = 0
+    silent_clips = silent_insertions = 0
+    wall_start = time.perf_counter()
+
+    with Pool(args.workers, initializer=_init_worker, initargs=(args.model,)) as pool:
+        for result in pool.imap(transcribe_file, [(path, args.block_size, grammar) for path in files]):
+            name = os.path.relpath(result["file"], args.directory)
+            if "error" in result:
+                print(f"{name}: skipped ({result['error']})")
+                results.append(result)
+                continue
+
+            total_audio += result["duration_s"]
+            total_decode += result["decode_s"]
+            wer_text = ""
+            reference = load_reference(result["file"])
+            if reference is not None:
+                errors, ref_words = word_errors(reference, result["transcript"])
+                result["reference"] = reference
+                result["errors"] = errors
+                total_errors += errors
+                total_ref_words += ref_words
+                if ref_words:
+                    result["wer"] = errors / ref_words
+                    wer_text = f"  WER {result['wer']:.1%}"
+                else:
+                    # No speech: WER is undefined, but every recognized word is an insertion
+                    result["wer"] = None
+                    silent_clips += 1
+                    silent_insertions += errors
+                    wer_text = f"  no speech, {errors} inserted words"
+
+            print(f"{name}: {result['duration_s']:.1f}s audio  RTF {result['rtf']:.3f}{wer_text}")
+            print(f"    {result['transcript']}")
+            results.append(result)
+
+    wall_time = time.perf_counter() - wall_start
+
+    print("=" * 70)
+    print(f"Audio: {total_audio:.1f}s   Decode CPU: {total_decode:.1f}s   Wall: {wall_time:.1f}s")
+    if total_audio:
+        print(f"Overall RTF (per worker): {total_decode / total_audio:.3f}")
+        print(f"Throughput: {total_audio / wall_time:.1f}x real time across {args.workers} workers")
+    if total_ref_words:
+        print(f"Overall WER: {total_errors / total_ref_words:.1%} ({total_errors}/{total_ref_words} words)")
+    if silent_clips:
+        # Counted in the overall WER's errors above, not in its reference words
+        print(f"No-speech clips: {silent_clips}, {silent_insertions} inserted words")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
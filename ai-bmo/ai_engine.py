@@ -1,23 +1,21 @@
 # ai_engine.py
-from transformers import AutoModelForCausalLM, AutoTokenizer
-import torch
+import os
+from transformers import AutoTokenizer
 
-tokenizer = AutoTokenizer.from_pretrained("microsoft/DialoGPT-small")
-model = AutoModelForCausalLM.from_pretrained("microsoft/DialoGPT-small")
+MODEL_NAME = "microsoft/DialoGPT-small"
+# BMO_BACKEND=onnx runs generation through ONNX Runtime instead of PyTorch
+BACKEND = os.getenv("BMO_BACKEND", "torch")
 
-chat_history_ids = None
+tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
 
-def get_ai_reply(user_input: str) -> str:
-    global chat_history_ids
-
-    new_input_ids = tokenizer.encode(user_input + tokenizer.eos_token, return_tensors='pt')
-    bot_input_ids = torch.cat([chat_history_ids, new_input_ids], dim=-1) if chat_history_ids is not None else new_input_ids
+if BACKEND == "onnx":
+    from onnx_engine import OnnxChatSession, load_onnx_model
+    session = OnnxChatSession(load_onnx_model(MODEL_NAME), tokenizer)
+else:
+    from chat_session import TorchChatSession
+    from model_loader import load_causal_lm
+    model = load_causal_lm(MODEL_NAME)
+    session = TorchChatSession(model, tokenizer)
 
-    chat_history_ids = model.generate(
-        bot_input_ids,
-        max_length=1000,
-        pad_token_id=tokenizer.eos_token_id
-    )
-
-    reply = tokenizer.decode(chat_history_ids[:, bot_input_ids.shape[-1]:][0], skip_special_tokens=True)
-    return reply
+def get_ai_reply(user_input: str) -> str:
+    return session.reply(user_input)
@@ -0,0 +1,96 @@
+"""
+PyTorch vs ONNX Runtime generation benchmark.
+
+    python benchmark_onnx.py --model microsoft/DialoGPT-small --turns 8
+
+Each backend runs the same conversation in its own process (so peak RSS is
+that backend's alone) with greedy decoding and the same KV-cached
+ChatSession logic, and reports generated tokens/sec, time to first token,
+peak RSS and whether the replies match.
+"""
+import argparse
+import multiprocessing as mp
+import time
+
+PROMPTS = [
+    "Hello BMO, how are you today?",
+    "What is your favorite video game?",
+    "Tell me something fun about robots.",
+    "Can you help me with my homework?",
+    "Do you like music?",
+    "What should we play next?",
+    "Tell me a joke.",
+    "Goodnight BMO.",
+]
+
+
+def peak_rss_mb():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:     # Windows
+        return float("nan")
+
+
+def run_backend(backend, model_name, turns, max_reply, threads, results):
+    from transformers import AutoTokenizer
+
+    start = time.perf_counter()
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if backend == "onnx":
+        from onnx_engine import OnnxChatSession, load_onnx_model
+        session = OnnxChatSession(load_onnx_model(model_name, threads), tokenizer, max_reply=max_reply)
+    else:
+        import torch
+        from chat_session import TorchChatSession
+        from model_loader import load_causal_lm
+        if threads:
+            torch.set_num_threads(threads)
+        session = TorchChatSession(load_causal_lm(model_name, quantized=False), tokenizer, max_reply=max_reply)
+    load_time = time.perf_counter() - start
+
+    session.reply("Hi!")     # warm-up, not counted
+    session.reset()
+    replies = [session.reply(PROMPTS[i % len(PROMPTS)]) for i in range(turns)]
+    stats = session.stats
+    results[backend] = {
+        "load_s": load_time,
+        "tokens": sum(s["reply_tokens"] for s in stats),
+        "seconds": sum(s["total_ms"] for s in stats) / 1000,
+        "first_token_ms": sum(s["first_token_ms"] for s in stats) / len(stats),
+        "peak_rss_mb": peak_rss_mb(),
+        "replies": replies,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PyTorch and ONNX Runtime text generation on CPU")
+    parser.add_argument("--model", default="microsoft/DialoGPT-small")
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument("--max-reply", type=int, default=40, help="Max tokens per reply")
+    parser.add_argument("--threads", type=int, default=None, help="CPU threads for both backends")
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    results = ctx.Manager().dict()
+    for backend in ("torch", "onnx"):
+        process = ctx.Process(target=run_backend, args=(backend, args.model, args.turns, args.max_reply, args.threads, results))
+        process.start()
+        process.join()
+        if backend not in results:
+            raise SystemExit(f"{backend} run failed")
+
+    torch_run, onnx_run = results["torch"], results["onnx"]
+    print(f"{'':<22} {'pytorch':>12} {'onnxruntime':>12}")
+    print("=" * 48)
+    print(f"{'load (s)':<22} {torch_run['load_s']:>12.2f} {onnx_run['load_s']:>12.2f}")
+    print(f"{'tokens/sec':<22} {torch_run['tokens'] / torch_run['seconds']:>12.1f} {onnx_run['tokens'] / onnx_run['seconds']:>12.1f}")
+    print(f"{'first token (ms)':<22} {torch_run['first_token_ms']:>12.1f} {onnx_run['first_token_ms']:>12.1f}")
+    print(f"{'peak RSS (MB)':<22} {torch_run['peak_rss_mb']:>12.0f} {onnx_run['peak_rss_mb']:>12.0f}")
+    same = sum(a == b for a, b in zip(torch_run["replies"], onnx_run["replies"]))
+    print(f"Identical replies: {same}/{args.turns}")
+    print("(ONNX load includes the one-time export if cache/onnx had no model yet)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+fp32 vs int8 dynamic quantization benchmark.
+
+    python benchmark_quantized.py --model microsoft/DialoGPT-small
+    python benchmark_quantized.py --model tiiuae/falcon-rw-1b --tokens 32
+
+Reports load time (fresh quantization and reload from the on-disk cache),
+weight size, CPU latency per generated token, and output quality as
+agreement with the fp32 greedy output and the perplexity each model
+assigns to the fp32 continuation.
+"""
+import argparse
+import io
+import shutil
+import tempfile
+import time
+import torch
+from transformers import AutoTokenizer
+import model_loader
+
+PROMPTS = [
+    "Hello BMO, how are you today?",
+    "What is your favorite video game?",
+    "Tell me something fun about robots.",
+    "Can you help me with my homework?",
+]
+
+
+def weight_mb(model):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1e6
+
+
+@torch.inference_mode()
+def generate(model, tokenizer, prompt, tokens):
+    ids = tokenizer.encode(prompt + tokenizer.eos_token, return_tensors="pt")
+    start = time.perf_counter()
+    out = model.generate(
+        ids, attention_mask=torch.ones_like(ids), max_new_tokens=tokens, min_new_tokens=tokens,
+        do_sample=False, pad_token_id=tokenizer.eos_token_id,
+    )
+    return ids, out[0, ids.shape[-1]:], time.perf_counter() - start
+
+
+@torch.inference_mode()
+def perplexity(model, prompt_ids, continuation):
+    ids = torch.cat([prompt_ids[0], continuation]).unsqueeze(0)
+    labels = ids.clone()
+    labels[0, :prompt_ids.shape[-1]] = -100     # score only the continuation
+    return torch.exp(model(ids, labels=labels).loss).item()
+
+
+def peak_rss_mb():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:     # Windows
+        return float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fp32 and int8 dynamic-quantized CPU inference")
+    parser.add_argument("--model", default="microsoft/DialoGPT-small")
+    parser.add_argument("--tokens", type=int, default=32, help="Tokens generated per prompt")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU threads")
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+
+    start = time.perf_counter()
+    fp32 = model_loader.load_causal_lm(args.model, quantized=False)
+    fp32_load = time.perf_counter() - start
+    rss_fp32 = peak_rss_mb()
+
+    # Time a cold quantization in an empty cache dir, leaving the real cache/quantized alone
+    model_loader.CACHE_DIR = tempfile.mkdtemp(prefix="bmo-quantized-")
+    try:
+        start = time.perf_counter()
+        model_loader.load_causal_lm(args.model, quantized=True)
+        quantize_time = time.perf_counter() - start
+        start = time.perf_counter()
+        int8 = model_loader.load_causal_lm(args.model, quantized=True)
+        reload_time = time.perf_counter() - start
+    finally:
+        shutil.rmtree(model_loader.CACHE_DIR, ignore_errors=True)
+
+    # One untimed run each so first-call allocation isn't counted
+    generate(fp32, tokenizer, PROMPTS[0], 2)
+    generate(int8, tokenizer, PROMPTS[0], 2)
+
+    results = {"fp32": [], "int8": []}
+    agreement = []
+    ppl = {"fp32": [], "int8": []}
+    for prompt in PROMPTS:
+        ids, reference, seconds = generate(fp32, tokenizer, prompt, args.tokens)
+        results["fp32"].append(seconds)
+        _, output, seconds = generate(int8, tokenizer, prompt, args.tokens)
+        results["int8"].append(seconds)
+        agreement.append((output == reference).float().mean().item())
+        ppl["fp32"].append(perplexity(fp32, ids, reference))
+        ppl["int8"].append(perplexity(int8, ids, reference))
+        print(f"• {prompt}\n    fp32: {tokenizer.decode(reference, skip_special_tokens=True)!r}"
+              f"\n    int8: {tokenizer.decode(output, skip_special_tokens=True)!r}")
+
+    def per_token_ms(name):
+        return sum(results[name]) / (len(PROMPTS) * args.tokens) * 1000
+
+    print("=" * 60)
+    print(f"{'':<24} {'fp32':>15} {'int8':>15}")
+    print(f"{'load (s)':<24} {fp32_load:>15.2f} {f'{quantize_time:.2f} / {reload_time:.2f}':>15}")
+    print(f"{'weights (MB)':<24} {weight_mb(fp32):>15.1f} {weight_mb(int8):>15.1f}")
+    print(f"{'ms per token':<24} {per_token_ms('fp32'):>15.1f} {per_token_ms('int8'):>15.1f}")
+    print(f"{'ppl of fp32 output':<24} {sum(ppl['fp32']) / len(PROMPTS):>15.2f} {sum(ppl['int8']) / len(PROMPTS):>15.2f}")
+    print(f"{'token agreement':<24} {'100%':>15} {sum(agreement) / len(agreement):>15.0%}")
+    print("int8 load = quantize from fp32 / reload from the on-disk cache")
+    print(f"Peak RSS: {rss_fp32:.0f} MB after fp32 load, {peak_rss_mb():.0f} MB at the end")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# chat_session.py
+import abc
+import time
+
+MAX_HISTORY_TOKENS = 512    # conversation kept in context (DialoGPT allows 1024 with the reply)
+MAX_REPLY_TOKENS = 100
+
+
+class ChatSession(abc.ABC):
+    """
+    A conversation whose key/value cache is kept between turns, so a turn only
+    runs the model over the new user message and the reply instead of the
+    whole history. History is a sliding window of whole turns capped at
+    max_history tokens; when it overflows, the oldest turns are dropped down
+    to half the budget and the cache is rebuilt once, so that cost is paid
+    rarely rather than every turn. Backends implement _forward().
+    """
+
+    def __init__(self, model, tokenizer, max_history=MAX_HISTORY_TOKENS, max_reply=MAX_REPLY_TOKENS):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.eos = tokenizer.eos_token_id
+        self.max_history = max_history
+        self.max_reply = max_reply
+        self.reset()
+
+    def reset(self):
+        self.turns = []         # token ids per utterance, each ending in eos
+        self.past = None        # cache covering every history token except `pending`
+        self.pending = []       # history tokens not yet run through the model
+        self.stats = []
+
+    def history_length(self):
+        return sum(len(turn) for turn in self.turns)
+
+    def _trim(self, incoming):
+        if self.history_length() + incoming + self.max_reply <= self.max_history:
+            return False
+        target = self.max_history // 2
+        while self.turns and self.history_length() + incoming + self.max_reply > target:
+            self.turns.pop(0)
+        # Positions shift once turns are dropped, so the cache can't be sliced; rebuild it
+        self.past = None
+        self.pending = [token for turn in self.turns for token in turn]
+        return True
+
+    @abc.abstractmethod
+    def _forward(self, input_ids):
+        """Run input_ids through the model on top of self.past; update self.past and return the last logits."""
+
+    def reply(self, user_input):
+        start = time.perf_counter()
+        user_ids = self.tokenizer.encode(user_input + self.tokenizer.eos_token)
+        trimmed = self._trim(len(user_ids))
+        self.turns.append(user_ids)
+
+        prompt = self.pending + user_ids
+        self.pending = []
+        logits = self._forward(prompt)
+        first_token = time.perf_counter()
+
+        # Greedy decoding, same as model.generate() with default settings
+        reply_ids = []
+        while len(reply_ids) < self.max_reply:
+            token = int(logits.argmax())
+            reply_ids.append(token)
+            if token == self.eos:
+                break
+            logits = self._forward([token])
+        if reply_ids[-1] != self.eos:
+            reply_ids.append(self.eos)
+        # The last token hasn't been fed yet; it goes in with the next prompt
+        self.pending = [reply_ids[-1]]
+        self.turns.append(reply_ids)
+
+        elapsed = time.perf_counter() - start
+        self.stats.append({
+            "prompt_tokens": len(prompt),
+            "reply_tokens": len(reply_ids),
+            "history_tokens": self.history_length(),
+            "trimmed": trimmed,
+            "first_token_ms": (first_token - start) * 1000,
+            "total_ms": elapsed * 1000,
+        })
+        return self.tokenizer.decode(reply_ids, skip_special_tokens=True)
+
+    def last_turn_stats(self):
+        return self.stats[-1] if self.stats else None
+
+
+class TorchChatSession(ChatSession):
+    def _forward(self, input_ids):
+        import torch
+        with torch.inference_mode():
+            output = self.model(torch.tensor([input_ids]), past_key_values=self.past, use_cache=True)
+        self.past = output.past_key_values
+        return output.logits[0, -1]
@@ -1,13 +1,16 @@
 import warnings
 import torch
-from transformers import pipeline, set_seed
+from transformers import AutoTokenizer, pipeline, set_seed
 from recognizer.recognizer import listen_for_command
+from model_loader import QUANTIZE, load_causal_lm
 
 # Suppress unnecessary warnings
 warnings.filterwarnings("ignore")
 
-# Load a better small chat-capable model
-chatbot = pipeline("text-generation", model="tiiuae/falcon-rw-1b", device=0 if torch.cuda.is_available() else -1)
+# Load a better small chat-capable model (BMO_QUANTIZE=1 runs it as int8 on the CPU)
+MODEL_NAME = "tiiuae/falcon-rw-1b"
+device = 0 if torch.cuda.is_available() and not QUANTIZE else -1
+chatbot = pipeline("text-generation", model=load_causal_lm(MODEL_NAME), tokenizer=AutoTokenizer.from_pretrained(MODEL_NAME), device=device)
 
 # Optional: Set seed for consistent output
 set_seed(42)
@@ -0,0 +1,73 @@
+# model_loader.py
+import os
+import time
+import torch
+import transformers
+from transformers import AutoModelForCausalLM
+from transformers.pytorch_utils import Conv1D
+
+# Opt in with BMO_QUANTIZE=1: int8 dynamic quantization of every linear layer (CPU only)
+QUANTIZE = os.getenv("BMO_QUANTIZE", "0") == "1"
+CACHE_DIR = os.path.join("cache", "quantized")
+
+
+def _conv1d_to_linear(module):
+    """GPT-2 style models (DialoGPT) use Conv1D for their projections; swap in nn.Linear so they get quantized."""
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+        else:
+            _conv1d_to_linear(child)
+
+
+def _select_engine():
+    engines = torch.backends.quantized.supported_engines
+    # fbgemm on x86, qnnpack on ARM boards
+    for engine in ("fbgemm", "x86", "qnnpack"):
+        if engine in engines:
+            torch.backends.quantized.engine = engine
+            return engine
+    return None
+
+
+def cache_path(model_name):
+    tag = f"{model_name.replace('/', '--')}-int8-torch{torch.__version__}-tf{transformers.__version__}.pt"
+    return os.path.join(CACHE_DIR, tag)
+
+
+def quantize(model):
+    _conv1d_to_linear(model)
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_causal_lm(model_name, quantized=QUANTIZE):
+    """
+    Load a causal LM, optionally int8-quantized. The quantized model is saved
+    under cache/quantized the first time and reloaded from there afterwards,
+    skipping both the fp32 load and the quantization pass.
+    """
+    if not quantized:
+        return AutoModelForCausalLM.from_pretrained(model_name).eval()
+
+    engine = _select_engine()
+    path = cache_path(model_name)
+    start = time.perf_counter()
+    if os.path.exists(path):
+        try:
+            model = torch.load(path, weights_only=False)
+            print(f"⚡ Loaded int8 {model_name} from cache in {time.perf_counter() - start:.1f}s")
+            return model.eval()
+        except Exception as e:
+            print(f"❌ Quantized cache unreadable, rebuilding: {e}")
+
+    model = quantize(AutoModelForCausalLM.from_pretrained(model_name).eval())
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = path + ".tmp"
+    torch.save(model, tmp_path)
+    os.replace(tmp_path, path)
+    print(f"⚡ Quantized {model_name} to int8 ({engine}) in {time.perf_counter() - start:.1f}s, cached at {path}")
+    return model
@@ -0,0 +1,98 @@
+# onnx_engine.py
+import os
+import time
+import numpy as np
+import onnxruntime as ort
+from chat_session import ChatSession
+
+EXPORT_DIR = os.path.join("cache", "onnx")
+
+
+def onnx_path(model_name):
+    return os.path.join(EXPORT_DIR, model_name.replace("/", "--") + ".onnx")
+
+
+def export(model_name, path):
+    """
+    Export a GPT-2 style causal LM (e.g. DialoGPT) to ONNX with past key/value
+    inputs and outputs, so generation can feed one token at a time. The graph
+    returns only the last position's logits. Needs torch; running it doesn't.
+    """
+    import inspect
+    import torch
+    from transformers import AutoModelForCausalLM
+
+    model = AutoModelForCausalLM.from_pretrained(model_name).eval()
+    config = model.config
+    layers, heads = config.n_layer, config.n_head
+    head_dim = config.n_embd // heads
+
+    class WithPast(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, position_ids, *past):
+            past_key_values = tuple((past[2 * i], past[2 * i + 1]) for i in range(layers))
+            output = self.model(input_ids=input_ids, position_ids=position_ids,
+                                past_key_values=past_key_values, use_cache=True)
+            present = [tensor for pair in output.past_key_values for tensor in pair]
+            return (output.logits[:, -1], *present)
+
+    past_names = [f"past_{kind}_{i}" for i in range(layers) for kind in ("key", "value")]
+    present_names = [f"present_{kind}_{i}" for i in range(layers) for kind in ("key", "value")]
+    dynamic_axes = {"input_ids": {1: "sequence"}, "position_ids": {1: "sequence"}}
+    dynamic_axes.update({name: {2: "past"} for name in past_names})
+    dynamic_axes.update({name: {2: "total"} for name in present_names})
+
+    sample_past = [torch.zeros(1, heads, 3, head_dim) for _ in past_names]
+    kwargs = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            WithPast(),
+            (torch.tensor([[1, 2]]), torch.tensor([[3, 4]]), *sample_past),
+            path,
+            input_names=["input_ids", "position_ids", *past_names],
+            output_names=["logits", *present_names],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            **kwargs,
+        )
+
+
+def load_onnx_model(model_name, threads=None):
+    """ONNX Runtime CPU session for the model, exporting it to cache/onnx on first use."""
+    path = onnx_path(model_name)
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        export(model_name, path)
+        print(f"📦 Exported {model_name} to ONNX in {time.perf_counter() - start:.1f}s ({path})")
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+    return ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+
+class OnnxChatSession(ChatSession):
+    """ChatSession that runs each step through ONNX Runtime, keeping past key/values as NumPy arrays."""
+
+    def __init__(self, model, tokenizer, **kwargs):
+        super().__init__(model, tokenizer, **kwargs)
+        self.past_names = [i.name for i in model.get_inputs() if i.name.startswith("past_")]
+        shape = model.get_inputs()[2].shape     # [1, heads, past, head_dim]
+        self._empty_past = np.zeros((1, shape[1], 0, shape[3]), dtype=np.float32)
+
+    def _forward(self, input_ids):
+        past = self.past or [self._empty_past] * len(self.past_names)
+        start = past[0].shape[2]
+        feed = {
+            "input_ids": np.array([input_ids], dtype=np.int64),
+            "position_ids": np.arange(start, start + len(input_ids), dtype=np.int64)[None, :],
+        }
+        feed.update(zip(self.past_names, past))
+        logits, *self.past = self.model.run(None, feed)
+        return logits[0]
+
@@ -1,11 +1,18 @@
 # tools/actions.py
 from datetime import datetime
+from tools.intents import IntentEngine
+
+tools = IntentEngine()
+
+@tools.intent("time", ["time", "what time", "the time", "what's the time"])
+def tell_time(command):
+    now = datetime.now().strftime("%I:%M %p")
+    return f"The time is {now}."
+
+@tools.intent("game", ["game", "play a game", "let's play a game"])
+def play_game(command):
+    return "Let's play a game! (feature launching soon)"
 
 def handle_tool(command):
-    if "time" in command:
-        now = datetime.now().strftime("%I:%M %p")
-        return f"The time is {now}."
-    elif "game" in command:
-        return "Let's play a game! (feature launching soon)"
-    else:
-        return None
+    match, reply = tools.handle(command)
+    return reply
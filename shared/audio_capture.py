@@ -0,0 +1,206 @@
+import threading
+import time
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+class AudioCapture:
+    """
+    Continuous microphone capture into a preallocated ring buffer, with a
+    vectorized energy / zero-crossing voice activity detector that cuts the
+    stream into utterances and drops the silence in between.
+    """
+
+    def __init__(self, samplerate=SAMPLE_RATE, frame_ms=30, buffer_seconds=30,
+                 pre_roll_ms=300, hangover_ms=700, max_utterance_seconds=15,
+                 min_energy=300.0, noise_ratio=3.0, max_zcr=0.35):
+        self.samplerate = samplerate
+        self.frame_len = samplerate * frame_ms // 1000
+        self.size = samplerate * buffer_seconds
+        self.ring = np.zeros(self.size, dtype=np.int16)
+        self.write_pos = 0
+        self._cond = threading.Condition()
+
+        self.pre_roll = samplerate * pre_roll_ms // 1000
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.max_utterance = samplerate * max_utterance_seconds
+        self.min_energy = min_energy
+        self.noise_ratio = noise_ratio
+        self.max_zcr = max_zcr
+        self.noise_floor = min_energy / noise_ratio
+        self._noise_lock = threading.Lock()
+
+        self.frames_seen = 0
+        self.frames_voiced = 0
+        self.overruns = 0
+        self.last_speech_end = None
+        self.stream = None
+        self._closed = False
+
+    def start(self):
+        import sounddevice as sd
+
+        self._closed = False
+        if self.stream is None:
+            self.stream = sd.InputStream(samplerate=self.samplerate, blocksize=self.frame_len * 4,
+                                         dtype='int16', channels=1, callback=self._callback)
+            self.stream.start()
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _callback(self, indata, frames, time_info, status):
+        if status:
+            print(status)
+        self.write(indata[:, 0])
+
+    def write(self, samples):
+        """Copy int16 samples into the ring without allocating."""
+        total = len(samples)
+        if total >= self.size:
+            samples = samples[-self.size:]
+        n = len(samples)
+        start = (self.write_pos + total - n) % self.size
+        first = min(n, self.size - start)
+        self.ring[start:start + first] = samples[:first]
+        self.ring[:n - first] = samples[first:]
+        with self._cond:
+            self.write_pos += total
+            self._cond.notify_all()
+
+    def _read(self, pos, n):
+        start = pos % self.size
+        if start + n <= self.size:
+            return self.ring[start:start + n].copy()
+        first = self.size - start
+        return np.concatenate((self.ring[start:], self.ring[:n - first]))
+
+    def classify(self, block, boost=1.0, adapt=True):
+        """
+        Return a voiced flag per row of a (frames, frame_len) int16 block.
+        With adapt, frames judged silent also update the noise floor.
+        """
+        x = block.astype(np.float32)
+        rms = np.sqrt(np.mean(x * x, axis=1))
+        signs = np.signbit(x)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        threshold = max(self.min_energy, self.noise_floor * self.noise_ratio) * boost
+        voiced = (rms > threshold) & ((zcr < self.max_zcr) | (rms > 2 * threshold))
+
+        # Track the background level from frames we consider silence
+        quiet = rms[~voiced]
+        if adapt and quiet.size:
+            with self._noise_lock:
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * float(np.median(quiet))
+        return voiced
+
+    def wait_for_onset(self, stop_event=None, min_frames=2, boost=2.0):
+        """
+        Watch the microphone without consuming it and return the sample
+        position where speech starts, or None once stop_event is set.
+        Used for barge-in while BMO is talking, so the threshold is raised
+        by `boost` to ignore BMO's own voice coming back from the speakers.
+        That echo doesn't count as background noise, so the noise floor is
+        left to the listening path.
+        """
+        with self._cond:
+            pos = self.write_pos
+        run = 0
+        while stop_event is None or not stop_event.is_set():
+            with self._cond:
+                if self._closed:
+                    return None
+                if self.write_pos - pos < self.frame_len:
+                    self._cond.wait(0.02)
+                    continue
+                write_pos = self.write_pos
+
+            n_frames = (write_pos - pos) // self.frame_len
+            block = self._read(pos, n_frames * self.frame_len).reshape(n_frames, self.frame_len)
+            for i, is_voiced in enumerate(self.classify(block, boost, adapt=False)):
+                run = run + 1 if is_voiced else 0
+                if run >= min_frames:
+                    return pos + (i + 1 - run) * self.frame_len
+            pos += n_frames * self.frame_len
+        return None
+
+    def utterance(self, timeout=None, start_pos=None):
+        """
+        Yield int16 byte chunks for the next utterance (with pre-roll), stopping
+        after `hangover_ms` of silence. Audio captured before the call (or
+        before `start_pos`, e.g. a barge-in onset) is discarded apart from the
+        pre-roll. Returns without yielding on timeout.
+        """
+        with self._cond:
+            start = self.write_pos if start_pos is None else start_pos
+            floor = max(0, start - self.pre_roll, self.write_pos - self.size)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        read_pos = floor
+        speech_start = None
+        silent_frames = 0
+
+        while True:
+            with self._cond:
+                while self.write_pos - read_pos < self.frame_len:
+                    if self._closed:
+                        return
+                    if deadline is not None and speech_start is None and time.monotonic() >= deadline:
+                        return
+                    self._cond.wait(0.1)
+                write_pos = self.write_pos
+
+            # Consumer fell more than a buffer behind: skip what was overwritten
+            if write_pos - read_pos > self.size - self.frame_len * 4:
+                self.overruns += 1
+                read_pos = write_pos - self.size // 2
+                floor = max(floor, read_pos)
+
+            n_frames = (write_pos - read_pos) // self.frame_len
+            block = self._read(read_pos, n_frames * self.frame_len).reshape(n_frames, self.frame_len)
+            voiced = self.classify(block)
+            self.frames_seen += n_frames
+
+            emit_from = 0 if speech_start is not None else None
+            for i, is_voiced in enumerate(voiced):
+                frame_pos = read_pos + i * self.frame_len
+                if speech_start is None:
+                    if not is_voiced:
+                        continue
+                    speech_start = frame_pos
+                    pre_start = max(floor, frame_pos - self.pre_roll)
+                    if pre_start < frame_pos:
+                        yield self._read(pre_start, frame_pos - pre_start).tobytes()
+                    emit_from = i
+
+                silent_frames = 0 if is_voiced else silent_frames + 1
+                ended = silent_frames >= self.hangover_frames
+                if ended or frame_pos + self.frame_len - speech_start >= self.max_utterance:
+                    # When the user actually stopped talking, in perf_counter time
+                    voiced_end = frame_pos + self.frame_len * (1 - silent_frames)
+                    self.last_speech_end = time.perf_counter() - (write_pos - voiced_end) / self.samplerate
+                    self.frames_voiced += i + 1 - emit_from
+                    yield block[emit_from:i + 1].tobytes()
+                    return
+
+            if emit_from is not None:
+                self.frames_voiced += n_frames - emit_from
+                yield block[emit_from:].tobytes()
+            read_pos += n_frames * self.frame_len
+
+    def stats(self):
+        seen = self.frames_seen or 1
+        return {
+            "frames_seen": self.frames_seen,
+            "frames_voiced": self.frames_voiced,
+            "silence_dropped": 1 - self.frames_voiced / seen,
+            "overruns": self.overruns,
+            "noise_floor": self.noise_floor,
+        }
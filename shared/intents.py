@@ -0,0 +1,165 @@
+"""
+Compiled intent matcher.
+
+Trigger phrases from every registered intent are compiled into one
+word-level Aho-Corasick automaton, so matching an utterance costs one pass
+over its words no matter how many intents exist. Words the automaton
+doesn't know are mapped to the closest known word (one edit away) through a
+precomputed deletion index, which absorbs typical speech-to-text slips like
+"set a timmer" or "list alarms". Results are ranked by how specific the
+matched phrase is, so "cancel the alarm" beats "alarm" without relying on
+if/elif order. A fuzzy match on a one-word phrase is never enough on its
+own: "tiger" or "hells bells" are more likely other words than "timer" or
+"hello".
+"""
+import re
+from collections import deque, namedtuple
+
+Match = namedtuple("Match", "intent score phrase fuzzy")
+
+_WORD = re.compile(r"[a-z0-9']+")
+FUZZY_MIN_LENGTH = 5
+FUZZY_PENALTY = 0.5
+
+
+def tokenize(text):
+    return _WORD.findall(text.lower())
+
+
+def _deletions(word):
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class Intent:
+    def __init__(self, name, phrases, handler=None, priority=0.0):
+        self.name = name
+        self.phrases = list(phrases)
+        self.handler = handler
+        self.priority = priority
+
+
+class IntentEngine:
+    """Registry of intents plus the automaton compiled from their trigger phrases."""
+
+    def __init__(self):
+        self.intents = {}
+        self._compiled = False
+
+    def register(self, name, phrases, handler=None, priority=0.0):
+        """Add (or replace) an intent. Two-word phrases also match written as one word."""
+        self.intents[name] = Intent(name, phrases, handler, priority)
+        self._compiled = False
+
+    def intent(self, name, phrases, priority=0.0):
+        """Decorator form of register() for plugin handlers."""
+        def decorator(handler):
+            self.register(name, phrases, handler, priority)
+            return handler
+        return decorator
+
+    def phrases(self):
+        return [phrase for intent in self.intents.values() for phrase in intent.phrases]
+
+    def compile(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        vocabulary = set()
+
+        for intent in self.intents.values():
+            for phrase in intent.phrases:
+                words = tokenize(phrase)
+                variants = [words]
+                if len(words) == 2:
+                    variants.append(["".join(words)])   # "stop watch" -> "stopwatch"
+                for variant in variants:
+                    self._insert(variant, intent, phrase)
+                    vocabulary.update(variant)
+
+        # Breadth-first failure links turn the trie into an automaton
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+        self._vocabulary = vocabulary
+        self._deleted = {}
+        for word in vocabulary:
+            if len(word) >= FUZZY_MIN_LENGTH:
+                for variant in _deletions(word):
+                    self._deleted.setdefault(variant, set()).add(word)
+        self._compiled = True
+
+    def _insert(self, words, intent, phrase):
+        state = 0
+        for word in words:
+            if word not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][word] = len(self._goto) - 1
+            state = self._goto[state][word]
+        self._out[state] = self._out[state] + [(intent, len(words), phrase)]
+
+    def _correct(self, word):
+        """Map a word to a known word at most one edit away, or return None."""
+        if len(word) < FUZZY_MIN_LENGTH:
+            return None
+        candidates = set(self._deleted.get(word, ()))            # a letter was dropped
+        for variant in _deletions(word):
+            if variant in self._vocabulary:                      # an extra letter
+                candidates.add(variant)
+            candidates.update(self._deleted.get(variant, ()))    # a letter was swapped
+        if not candidates:
+            return None
+        return min(candidates, key=lambda w: (abs(len(w) - len(word)), w))
+
+    def match(self, text, limit=3):
+        """Return up to `limit` intents that match text, best first."""
+        if not self._compiled:
+            self.compile()
+
+        best = {}
+        state = 0
+        fuzzy_positions = []
+        for position, word in enumerate(tokenize(text)):
+            if word not in self._vocabulary:
+                corrected = self._correct(word)
+                if corrected is not None:
+                    word = corrected
+                    fuzzy_positions.append(position)
+            while state and word not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(word, 0)
+
+            for intent, length, phrase in self._out[state]:
+                fuzzy = sum(1 for p in fuzzy_positions if p > position - length)
+                score = length - FUZZY_PENALTY * fuzzy + intent.priority
+                if intent.name not in best or score > best[intent.name].score:
+                    best[intent.name] = Match(intent.name, score, phrase, fuzzy > 0)
+
+        ranked = sorted(best.values(), key=lambda m: m.score, reverse=True)
+        return ranked[:limit]
+
+    def best(self, text, min_score=0.5):
+        """Top match scoring above min_score; the default rejects one corrected word alone (1 - FUZZY_PENALTY)."""
+        matches = self.match(text, limit=1)
+        if matches and matches[0].score > min_score:
+            return matches[0]
+        return None
+
+    def handle(self, text, *args, **kwargs):
+        """Run the handler of the best matching intent; returns (match, result) or (None, None)."""
+        match = self.best(text)
+        if match is None:
+            return None, None
+        handler = self.intents[match.intent].handler
+        result = handler(text, *args, **kwargs) if handler is not None else None
+        return match, result
@@ -0,0 +1,83 @@
+"""
+Modules shared by the BMO apps.
+
+ai-assistant, ai-bmo and virtual-bmo each run from their own directory with
+their own virtual environment, so they can't import a common package.
+Instead the one real copy of each shared module lives in shared/ and this
+script writes it into every app that uses it:
+
+    python shared/sync.py           # after editing a module in shared/
+    python shared/sync.py --check   # fail if any app copy has drifted
+
+Edit the file in shared/, never an app's copy; test_sync.py runs the check.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARED = os.path.join(ROOT, "shared")
+
+TARGETS = {
+    "intents.py": [
+        "ai-assistant/intents.py",
+        "ai-bmo/tools/intents.py",
+        "virtual-bmo/voice_ai/intents.py",
+    ],
+    "audio_capture.py": [
+        "ai-assistant/audio_capture.py",
+        "virtual-bmo/voice_ai/audio_capture.py",
+    ],
+    "audio_cache.py": [
+        "ai-assistant/audio_cache.py",
+        "virtual-bmo/voice_ai/audio_cache.py",
+    ],
+}
+
+HEADER = "# Generated from shared/{name} by shared/sync.py -- edit that file, not this copy.\n"
+
+
+def expected(name):
+    with open(os.path.join(SHARED, name), encoding="utf-8") as f:
+        return HEADER.format(name=name) + f.read()
+
+
+def stale_copies():
+    """(app path, shared name) for every copy that doesn't match its source"""
+    stale = []
+    for name, targets in TARGETS.items():
+        content = expected(name)
+        for target in targets:
+            try:
+                with open(os.path.join(ROOT, target), encoding="utf-8") as f:
+                    current = f.read()
+            except FileNotFoundError:
+                current = None
+            if current != content:
+                stale.append((target, name))
+    return stale
+
+
+def sync():
+    for target, name in stale_copies():
+        with open(os.path.join(ROOT, target), "w", encoding="utf-8") as f:
+            f.write(expected(name))
+        print(f"updated {target} from shared/{name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy shared modules into the BMO apps")
+    parser.add_argument("--check", action="store_true", help="Only report copies that differ")
+    args = parser.parse_args()
+
+    if not args.check:
+        sync()
+        return
+    stale = stale_copies()
+    for target, name in stale:
+        print(f"{target} is out of date; edit shared/{name} and run python shared/sync.py")
+    sys.exit(1 if stale else 0)
+
+
+if __name__ == "__main__":
+    main()
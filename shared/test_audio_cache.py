@@ -0,0 +1,27 @@
+import os
+
+import numpy as np
+
+from audio_cache import AudioCache
+
+
+def test_memory_hits_keep_the_wav_fresh(tmp_path):
+    cache = AudioCache(cache_dir=str(tmp_path))
+    cache.put("Command executed.", "voice", 1.0, np.zeros(160, dtype=np.int16), 16000)
+    path = cache._path(cache.key("Command executed.", "voice", 1.0))
+    os.utime(path, (1, 1))
+
+    assert cache.get("command  executed.", "voice", 1.0) is not None
+    assert cache.memory_hits == 1
+    assert os.path.getmtime(path) > 1
+    # A restarted cache sees the phrase as recently used, not as its oldest entry
+    assert AudioCache(cache_dir=str(tmp_path)).disk[os.path.basename(path)[:-4]][0] > 1
+
+
+def test_memory_hit_after_the_wav_is_gone(tmp_path):
+    cache = AudioCache(cache_dir=str(tmp_path))
+    cache.put("Hi", "voice", 1.0, np.zeros(160, dtype=np.int16), 16000)
+    os.remove(cache._path(cache.key("Hi", "voice", 1.0)))
+
+    assert cache.get("Hi", "voice", 1.0) is not None
+    assert cache.stats()["disk_entries"] == 0
@@ -0,0 +1,39 @@
+import threading
+import time
+
+import numpy as np
+
+from audio_capture import AudioCapture
+
+
+def frames(level, count=10, frame_len=480):
+    """Frames of a low-ZCR square wave with the given RMS level."""
+    pattern = np.repeat(np.array([level, -level], dtype=np.int16), 40)
+    return np.tile(pattern, frame_len * count // pattern.size).reshape(count, frame_len)
+
+
+def test_listening_adapts_noise_floor_to_silence():
+    capture = AudioCapture()
+    before = capture.noise_floor
+    capture.classify(frames(50))
+    assert capture.noise_floor != before
+
+
+def test_barge_in_watch_does_not_learn_echo_as_noise():
+    capture = AudioCapture()
+    before = capture.noise_floor
+    stop = threading.Event()
+    onset = []
+    watcher = threading.Thread(target=lambda: onset.append(capture.wait_for_onset(stop_event=stop)))
+    watcher.start()
+    time.sleep(0.05)
+    # BMO's echo: speech when listening, but under the boosted barge-in threshold
+    echo = frames(450)
+    capture.write(echo.ravel())
+    time.sleep(0.1)
+    stop.set()
+    watcher.join(5)
+
+    assert onset == [None]
+    assert capture.noise_floor == before
+    assert capture.classify(echo).all()
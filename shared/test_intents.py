@@ -0,0 +1,29 @@
+from intents import IntentEngine
+
+
+def engine():
+    commands = IntentEngine()
+    commands.register("timer", ["set a timer", "timer"])
+    commands.register("hello", ["hello", "hello bmo"])
+    commands.register("cancel", ["cancel", "cancel the alarm"])
+    commands.register("alarm", ["set an alarm", "alarm"])
+    return commands
+
+
+def test_exact_one_word_phrase_matches():
+    assert engine().best("timer please").intent == "timer"
+
+
+def test_one_corrected_word_alone_is_not_enough():
+    commands = engine()
+    for text in ("tiger", "how many times", "hells bells", "timmer"):
+        assert commands.best(text) is None, text
+
+
+def test_corrected_word_inside_a_longer_phrase_still_matches():
+    match = engine().best("set a timmer")
+    assert match.intent == "timer" and match.fuzzy
+
+
+def test_most_specific_phrase_wins():
+    assert engine().best("cancel the alarm").intent == "cancel"
@@ -0,0 +1,5 @@
+from sync import stale_copies
+
+
+def test_app_copies_match_shared_sources():
+    assert stale_copies() == []
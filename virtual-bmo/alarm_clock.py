@@ -0,0 +1,181 @@
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+SCHEDULE_PATH = "schedules.json"
+
+
+def schedule_kind(command):
+    """Which kind of schedule a spoken command is about ("stop watch" or "stopwatch"), or None for all."""
+    command = command.replace("stop watch", "stopwatch")
+    for kind in ("alarm", "timer", "stopwatch"):
+        if kind in command:
+            return kind
+    return None
+
+
+class Schedule:
+    """An alarm or countdown timer (due at a wall-clock time) or a running stopwatch."""
+
+    def __init__(self, id, kind, label, message=None, due=None, started=None):
+        self.id = id
+        self.kind = kind
+        self.label = label
+        self.message = message
+        self.due = due
+        self.started = started if started is not None else time.time()
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    def describe(self):
+        if self.kind == "stopwatch":
+            return f"stopwatch {self.label} running for {int(time.time() - self.started)} seconds"
+        due = datetime.fromtimestamp(self.due)
+        if self.kind == "alarm":
+            return f"alarm {self.label} at {due.strftime('%I:%M %p').lstrip('0')}"
+        return f"timer {self.label} with {max(0, int(self.due - time.time()))} seconds left"
+
+
+class Scheduler:
+    """
+    One thread and one heap for every alarm, timer and stopwatch. The thread
+    sleeps until the next deadline (or until the schedule changes), so idle
+    CPU is near zero and alarms fire on time instead of on a polling tick.
+    Schedules are saved to disk on every change and reloaded at startup.
+    """
+
+    def __init__(self, on_fire, path=SCHEDULE_PATH):
+        self.on_fire = on_fire
+        self.path = path
+        self.schedules = {}
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._running = False
+        self.thread = threading.Thread(target=self._run, name="bmo-scheduler", daemon=True)
+
+    def start(self):
+        self._load()
+        self._running = True
+        self.thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not load schedules: {e}")
+            return
+        with self._cond:
+            for entry in entries:
+                schedule = Schedule(**entry)
+                self.schedules[schedule.id] = schedule
+                if schedule.due is not None:
+                    heapq.heappush(self._heap, (schedule.due, schedule.id))
+            self._ids = itertools.count(max(self.schedules, default=0) + 1)
+        if self.schedules:
+            print(f"⏰ Restored {len(self.schedules)} alarms/timers/stopwatches")
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump([s.to_dict() for s in self.schedules.values()], f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _add(self, kind, message=None, due=None):
+        with self._cond:
+            schedule_id = next(self._ids)
+            count = sum(1 for s in self.schedules.values() if s.kind == kind) + 1
+            schedule = Schedule(schedule_id, kind, str(count), message, due)
+            self.schedules[schedule_id] = schedule
+            if due is not None:
+                heapq.heappush(self._heap, (due, schedule_id))
+            self._save()
+            self._cond.notify_all()
+        return schedule
+
+    def add_alarm(self, at, message="⏰ Wake up! This is your alarm!"):
+        """Ring at the next occurrence of the given datetime.time."""
+        now = datetime.now()
+        due = datetime.combine(now.date(), at)
+        if due <= now:
+            due += timedelta(days=1)
+        return self._add("alarm", message, due.timestamp())
+
+    def add_timer(self, seconds, message="⏰ Time's up!"):
+        return self._add("timer", message, time.time() + seconds)
+
+    def start_stopwatch(self):
+        return self._add("stopwatch")
+
+    def stop_stopwatch(self):
+        """Stop the most recently started stopwatch, returning elapsed seconds (or None)."""
+        with self._cond:
+            watches = [s for s in self.schedules.values() if s.kind == "stopwatch"]
+            if not watches:
+                return None
+            latest = max(watches, key=lambda s: s.started)
+            del self.schedules[latest.id]
+            self._save()
+        return time.time() - latest.started
+
+    def cancel(self, kind=None):
+        """Cancel every schedule of a kind (or everything), returning what was removed."""
+        with self._cond:
+            removed = [s for s in self.schedules.values() if kind is None or s.kind == kind]
+            for schedule in removed:
+                del self.schedules[schedule.id]
+            # Heap entries for removed ids are skipped lazily when they come due
+            self._save()
+            self._cond.notify_all()
+        return removed
+
+    def list(self, kind=None):
+        with self._cond:
+            found = [s for s in self.schedules.values() if kind is None or s.kind == kind]
+        return sorted(found, key=lambda s: s.due if s.due is not None else s.started)
+
+    def _run(self):
+        while True:
+            due_now = []
+            with self._cond:
+                while self._running:
+                    # Drop heap entries for cancelled schedules
+                    while self._heap and self._heap[0][1] not in self.schedules:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.time()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if not self._running:
+                    return
+
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    _, schedule_id = heapq.heappop(self._heap)
+                    schedule = self.schedules.pop(schedule_id, None)
+                    if schedule is not None:
+                        due_now.append(schedule)
+                self._save()
+
+            for schedule in due_now:
+                late = time.time() - schedule.due
+                if late > 1:
+                    print(f"⏰ {schedule.kind} {schedule.label} fired {late:.1f}s late")
+                # Speaking blocks, so don't hold up the next deadline
+                threading.Thread(target=self.on_fire, args=(schedule,), daemon=True).start()
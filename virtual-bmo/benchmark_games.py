@@ -0,0 +1,74 @@
+"""
+Steps/sec of the headless game cores, one game at a time and batched.
+
+    python benchmark_games.py --batch 4096 --seconds 3
+
+Games are driven by a random policy and restarted as soon as they end.
+"""
+import argparse
+import random
+import time
+import numpy as np
+from games.snake_core import SnakeGame, BatchSnake
+from games.flappy_core import FlappyGame, BatchFlappy
+
+
+def run_single(game, policy, seconds):
+    steps = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        for _ in range(1000):
+            _, done = game.step(policy())
+            if done:
+                game.reset()
+        steps += 1000
+    return steps
+
+
+def run_batch(env, policy, seconds):
+    steps = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        _, done = env.step(policy())
+        if done.any():
+            env.reset(done)
+        steps += env.n
+    return steps
+
+
+def report(name, fn, seconds):
+    start = time.perf_counter()
+    steps = fn(seconds)
+    rate = steps / (time.perf_counter() - start)
+    print(f"{name:<24} {rate:>14,.0f} steps/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the headless Snake and Flappy Bird cores")
+    parser.add_argument("--batch", type=int, default=4096, help="Games per batched step")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration of each run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    np_rng = np.random.default_rng(args.seed)
+    n = args.batch
+
+    print(f"{'run':<24} {'throughput':>20}")
+    print("=" * 45)
+    single = report("snake x1", lambda s: run_single(
+        SnakeGame(args.seed), lambda: rng.randrange(4) if rng.random() < 0.2 else None, s), args.seconds)
+    batch = report(f"snake x{n} (numpy)", lambda s: run_batch(
+        BatchSnake(n, args.seed), lambda: np_rng.integers(0, 4, n), s), args.seconds)
+    print(f"{'':<24} {batch / single:>13.1f}x faster")
+
+    single = report("flappy x1", lambda s: run_single(
+        FlappyGame(args.seed), lambda: rng.random() < 0.08, s), args.seconds)
+    batch = report(f"flappy x{n} (numpy)", lambda s: run_batch(
+        BatchFlappy(n, args.seed), lambda: np_rng.random(n) < 0.08, s), args.seconds)
+    print(f"{'':<24} {batch / single:>13.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Render loop benchmark: the old full-screen redraw against FaceRenderer.
+
+    python benchmark_render.py              # in a window
+    python benchmark_render.py --headless   # SDL dummy video driver
+
+Each scenario runs for a few seconds showing the idle face and the same
+status text, and reports frame rate, time spent drawing per frame and the
+CPU used by the process.
+"""
+import argparse
+import os
+import time
+
+
+def run_legacy(pygame, screen, font, seconds, fps=None):
+    """What main.py used to do: blit the whole face and re-render the text every frame."""
+    face = pygame.transform.scale(pygame.image.load(os.path.join("assets", "bmo1.jpg")), (480, 320))
+    clock = pygame.time.Clock()
+    frames, draw_time = 0, 0.0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pygame.event.pump()
+        start = time.perf_counter()
+        screen.blit(face, (0, 0))
+        screen.blit(font.render("Press SPACE to talk to BMO", True, (0, 0, 0)), (10, 280))
+        pygame.display.flip()
+        draw_time += time.perf_counter() - start
+        frames += 1
+        if fps:
+            clock.tick(fps)
+    return frames, draw_time
+
+
+def run_renderer(pygame, screen, font, seconds, active):
+    from face_renderer import AssetCache, TextCache, FaceRenderer, load_faces
+
+    renderer = FaceRenderer(screen, load_faces(AssetCache(), "assets", (480, 320)), TextCache(font))
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pygame.event.pump()
+        renderer.set_text("text", "Press SPACE to talk to BMO", (10, 280))
+        if active:
+            dots = "." * (pygame.time.get_ticks() // 400 % 4)
+            renderer.set_text("state", "Listening" + dots, (10, 10))
+        renderer.draw()
+        renderer.tick(active)
+    return renderer.frames, renderer.draw_time
+
+
+def measure(name, fn, seconds):
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    frames, draw_time = fn(seconds)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    print(f"{name:<28} {frames / wall:>7.1f} {draw_time / frames * 1000:>10.3f} {cpu / wall * 100:>7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the old and new BMO face render loops")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each scenario")
+    parser.add_argument("--headless", action="store_true", help="Use the SDL dummy video driver")
+    args = parser.parse_args()
+
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import pygame
+
+    pygame.init()
+    screen = pygame.display.set_mode((480, 320))
+    font = pygame.font.SysFont("Arial", 20)
+
+    print(f"{'scenario':<28} {'fps':>7} {'draw ms':>10} {'cpu':>8}")
+    print("=" * 56)
+    measure("before: uncapped full redraw", lambda s: run_legacy(pygame, screen, font, s), args.seconds)
+    measure("before: 30 fps full redraw", lambda s: run_legacy(pygame, screen, font, s, fps=30), args.seconds)
+    measure("after: idle (dirty rects)", lambda s: run_renderer(pygame, screen, font, s, active=False), args.seconds)
+    measure("after: listening animation", lambda s: run_renderer(pygame, screen, font, s, active=True), args.seconds)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import glob
+import os
+import time
+from collections import OrderedDict
+import pygame
+
+
+class AssetCache:
+    """Images loaded, scaled and convert()ed once, then reused (reloaded only if the file changes)."""
+
+    def __init__(self):
+        self._surfaces = {}
+
+    def get(self, path, size=None, alpha=False):
+        key = (path, size, alpha, os.path.getmtime(path))
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = pygame.image.load(path)
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            if size is not None and surface.get_size() != size:
+                surface = pygame.transform.scale(surface, size)
+            self._surfaces[key] = surface
+        return surface
+
+
+def load_faces(assets, asset_dir, size, default="bmo1.jpg"):
+    """The default face plus mood variants named bmo_<mood>.png / .jpg."""
+    faces = {"default": assets.get(os.path.join(asset_dir, default), size)}
+    for path in glob.glob(os.path.join(asset_dir, "bmo_*.*")):
+        mood = os.path.splitext(os.path.basename(path))[0][len("bmo_"):]
+        faces[mood] = assets.get(path, size)
+    return faces
+
+
+class TextCache:
+    """Rendered text surfaces keyed by (text, color), least recently used dropped first."""
+
+    def __init__(self, font, max_entries=64):
+        self.font = font
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+
+    def render(self, text, color=(0, 0, 0)):
+        key = (text, color)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self.font.render(text, True, color)
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+
+
+class FaceRenderer:
+    """
+    Draws the face with overlay, text and state layers on top, repainting and
+    pushing to the display only the rectangles that changed since the last
+    frame. Runs at active_fps while something animates and idle_fps otherwise.
+    """
+
+    LAYERS = ("overlay", "text", "state")
+
+    def __init__(self, screen, faces, text_cache, active_fps=30, idle_fps=10):
+        self.screen = screen
+        self.faces = faces
+        self.text = text_cache
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.mood = "default"
+        self.layers = {name: None for name in self.LAYERS}
+        self._dirty = [screen.get_rect()]
+        self.clock = pygame.time.Clock()
+
+        self.frames = 0
+        self.frames_drawn = 0
+        self.pixels_drawn = 0
+        self.draw_time = 0.0
+        self._started = (time.perf_counter(), time.process_time())
+
+    def background(self):
+        return self.faces.get(self.mood, self.faces["default"])
+
+    def set_mood(self, mood):
+        mood = mood if mood in self.faces else "default"
+        if mood != self.mood:
+            self.mood = mood
+            self.invalidate()
+
+    def set_layer(self, name, surface, position=(0, 0)):
+        old = self.layers[name]
+        if old is not None and old[0] is surface and old[1] == position:
+            return
+        if old is None and surface is None:
+            return
+        if old is not None:
+            self._dirty.append(old[0].get_rect(topleft=old[1]))
+        if surface is not None:
+            self._dirty.append(surface.get_rect(topleft=position))
+            self.layers[name] = (surface, position)
+        else:
+            self.layers[name] = None
+
+    def set_text(self, name, text, position, color=(0, 0, 0)):
+        self.set_layer(name, self.text.render(text, color) if text else None, position)
+
+    def invalidate(self, screen=None):
+        """Repaint everything next frame (e.g. after a game used the display)."""
+        if screen is not None:
+            self.screen = screen
+        self._dirty = [self.screen.get_rect()]
+
+    def draw(self):
+        self.frames += 1
+        if not self._dirty:
+            return False
+        start = time.perf_counter()
+        background = self.background()
+        for rect in self._dirty:
+            self.screen.set_clip(rect)
+            self.screen.blit(background, rect, rect)
+            for layer in self.layers.values():
+                if layer is not None:
+                    self.screen.blit(*layer)
+            self.pixels_drawn += rect.width * rect.height
+        self.screen.set_clip(None)
+        pygame.display.update(self._dirty)
+        self._dirty = []
+        self.frames_drawn += 1
+        self.draw_time += time.perf_counter() - start
+        return True
+
+    def tick(self, active):
+        return self.clock.tick(self.active_fps if active else self.idle_fps)
+
+    def stats(self):
+        wall = time.perf_counter() - self._started[0]
+        cpu = time.process_time() - self._started[1]
+        return {
+            "frames": self.frames,
+            "frames_drawn": self.frames_drawn,
+            "avg_draw_ms": self.draw_time / self.frames_drawn * 1000 if self.frames_drawn else 0.0,
+            "avg_frame_ms": wall / self.frames * 1000 if self.frames else 0.0,
+            "pixels_per_frame": self.pixels_drawn / self.frames if self.frames else 0.0,
+            "process_cpu_percent": cpu / wall * 100 if wall else 0.0,
+        }
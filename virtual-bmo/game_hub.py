@@ -0,0 +1,70 @@
+import time
+import pygame
+from games.snake_game import SnakeScene
+from games.flappy_bird import FlappyScene
+
+# name -> (scene class, words that pick it in a voice command)
+GAMES = {
+    "snake": (SnakeScene, ("snake",)),
+    "flappy bird": (FlappyScene, ("flappy", "bird")),
+}
+DEFAULT_GAME = "snake"
+
+
+class GameHub:
+    """
+    Owns a scene stack on top of BMO's face. Every game is constructed once
+    at startup (modules imported, fonts and surfaces created) and shares the
+    main display and clock, so starting one is a reset() and a push, and
+    leaving it is a pop.
+    """
+
+    def __init__(self, screen, games=GAMES):
+        self.screen = screen
+        self.keywords = {name: words for name, (_, words) in games.items()}
+        start = time.perf_counter()
+        self.scenes = {name: scene_class() for name, (scene_class, _) in games.items()}
+        self.preload_ms = (time.perf_counter() - start) * 1000
+        self.stack = []
+        self._pushed_at = None
+
+    def choose(self, command):
+        """The game named in a voice command, or the default one."""
+        words = command.lower().split()
+        for name, keywords in self.keywords.items():
+            if any(word in words for word in keywords):
+                return name
+        return DEFAULT_GAME
+
+    @property
+    def active(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, name):
+        scene = self.scenes[name]
+        scene.reset()
+        self.stack.append(scene)
+        pygame.display.set_caption(scene.caption)
+        self._pushed_at = time.perf_counter()
+
+    def pop(self):
+        self.stack.pop()
+        if self.active is not None:
+            pygame.display.set_caption(self.active.caption)
+
+    def frame(self, events):
+        """Run one frame of the top scene. Returns False once it has finished and been popped."""
+        scene = self.active
+        for event in events:
+            scene.handle_event(event)
+        if not scene.finished:
+            scene.update()
+        if scene.finished:
+            self.pop()
+            return False
+        scene.draw(self.screen)
+        pygame.display.flip()
+        if self._pushed_at is not None:
+            print(f"🎮 {scene.caption} on screen {(time.perf_counter() - self._pushed_at) * 1000:.1f} ms after launch")
+            self._pushed_at = None
+        return True
@@ -0,0 +1,155 @@
+"""
+Flappy Bird rules without a display.
+
+FlappyGame is one seedable game stepped at 60 ticks per second; pipes are
+kept as plain [x, gap_center, passed] entries in a deque instead of Rects.
+BatchFlappy runs thousands of birds at once with NumPy. All games share
+the pipe schedule (pipes spawn every PIPE_INTERVAL ticks), only the gap
+heights differ, so pipe x positions are one small array for the batch.
+"""
+import random
+from collections import deque
+import numpy as np
+
+SCREEN_WIDTH = 400
+SCREEN_HEIGHT = 600
+BIRD_X = 50
+BIRD_SIZE = 30
+GRAVITY = 0.5
+JUMP_STRENGTH = -8
+PIPE_WIDTH = 70
+PIPE_GAP = 150
+PIPE_SPEED = 3
+PIPE_INTERVAL = 90      # ticks between pipes (1.5 s at 60 fps)
+GAP_MIN = 150
+GAP_MAX = SCREEN_HEIGHT - 150
+
+
+def pipe_rects(x, center):
+    """(x, y, w, h) of the top and bottom pipe of a pair."""
+    return ((x, 0, PIPE_WIDTH, center - PIPE_GAP // 2),
+            (x, center + PIPE_GAP // 2, PIPE_WIDTH, SCREEN_HEIGHT))
+
+
+class FlappyGame:
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        self.bird_y = SCREEN_HEIGHT // 2
+        self.velocity = 0.0
+        self.pipes = deque()
+        self.score = 0
+        self.ticks = 0
+        self.done = False
+
+    def step(self, flap=False):
+        """Advance one tick, flapping first if asked. Returns (reward, done)."""
+        if self.done:
+            return 0, True
+        if flap:
+            self.velocity = JUMP_STRENGTH
+        self.velocity += GRAVITY
+        self.bird_y += self.velocity
+
+        if self.ticks % PIPE_INTERVAL == 0:
+            self.pipes.append([SCREEN_WIDTH, self.rng.randint(GAP_MIN, GAP_MAX), False])
+        self.ticks += 1
+
+        reward = 0
+        for pipe in self.pipes:
+            pipe[0] -= PIPE_SPEED
+            if not pipe[2] and pipe[0] + PIPE_WIDTH < BIRD_X:
+                pipe[2] = True
+                self.score += 1
+                reward += 1
+        while self.pipes and self.pipes[0][0] + PIPE_WIDTH < 0:
+            self.pipes.popleft()
+
+        if self._collided():
+            self.done = True
+            return -1, True
+        return reward, False
+
+    def _collided(self):
+        top, bottom = self.bird_y, self.bird_y + BIRD_SIZE
+        if top <= 0 or bottom >= SCREEN_HEIGHT:
+            return True
+        for x, center, _ in self.pipes:
+            if x < BIRD_X + BIRD_SIZE and x + PIPE_WIDTH > BIRD_X:
+                if top < center - PIPE_GAP // 2 or bottom > center + PIPE_GAP // 2:
+                    return True
+        return False
+
+    def observation(self):
+        upcoming = next((p for p in self.pipes if p[0] + PIPE_WIDTH >= BIRD_X), None)
+        return {
+            "bird_y": self.bird_y,
+            "velocity": self.velocity,
+            "pipe_x": upcoming[0] if upcoming else None,
+            "gap_center": upcoming[1] if upcoming else None,
+            "score": self.score,
+        }
+
+
+class BatchFlappy:
+    """n birds stepped together; reset() restarts finished games from tick 0."""
+
+    SLOTS = (SCREEN_WIDTH + PIPE_WIDTH) // (PIPE_SPEED * PIPE_INTERVAL) + 2
+
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.bird_y = np.zeros(n)
+        self.velocity = np.zeros(n)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.pipe_x = np.full((n, self.SLOTS), -PIPE_WIDTH - 1, dtype=np.int64)
+        self.centers = np.zeros((n, self.SLOTS), dtype=np.int64)
+        self.passed = np.ones((n, self.SLOTS), dtype=bool)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        idx = slice(None) if mask is None else np.flatnonzero(mask)
+        self.bird_y[idx] = SCREEN_HEIGHT // 2
+        self.velocity[idx] = 0.0
+        self.ticks[idx] = 0
+        self.pipe_x[idx] = -PIPE_WIDTH - 1
+        self.passed[idx] = True
+        self.score[idx] = 0
+        self.done[idx] = False
+
+    def step(self, flap=None):
+        """flap: bool array (or None for no flaps). Returns (rewards, done)."""
+        alive = ~self.done
+        rewards = np.zeros(self.n, dtype=np.int64)
+        if flap is not None:
+            self.velocity = np.where(alive & np.asarray(flap, dtype=bool), JUMP_STRENGTH, self.velocity)
+        self.velocity = np.where(alive, self.velocity + GRAVITY, self.velocity)
+        self.bird_y = np.where(alive, self.bird_y + self.velocity, self.bird_y)
+
+        spawn = np.flatnonzero(alive & (self.ticks % PIPE_INTERVAL == 0))
+        if spawn.size:
+            slot = (self.ticks[spawn] // PIPE_INTERVAL) % self.SLOTS
+            self.pipe_x[spawn, slot] = SCREEN_WIDTH
+            self.centers[spawn, slot] = self.rng.integers(GAP_MIN, GAP_MAX + 1, spawn.size)
+            self.passed[spawn, slot] = False
+        self.ticks[alive] += 1
+        self.pipe_x[alive] -= PIPE_SPEED
+
+        newly_passed = alive[:, None] & ~self.passed & (self.pipe_x + PIPE_WIDTH < BIRD_X)
+        self.passed |= newly_passed
+        gained = newly_passed.sum(axis=1)
+        self.score += gained
+        rewards += gained
+
+        top = self.bird_y[:, None]
+        bottom = top + BIRD_SIZE
+        overlap_x = (self.pipe_x < BIRD_X + BIRD_SIZE) & (self.pipe_x + PIPE_WIDTH > BIRD_X)
+        hit_pipe = overlap_x & ((top < self.centers - PIPE_GAP // 2) | (bottom > self.centers + PIPE_GAP // 2))
+        crashed = alive & (hit_pipe.any(axis=1) | (self.bird_y <= 0) | (self.bird_y + BIRD_SIZE >= SCREEN_HEIGHT))
+        self.done |= crashed
+        rewards[crashed] = -1
+        return rewards, self.done
@@ -0,0 +1,48 @@
+import pygame
+
+
+class Scene:
+    """
+    A game that draws into a surface it is handed instead of owning the
+    display. The game hub (or run_standalone) feeds it events, calls
+    update() and draw() once per frame at `fps`, and drops it once
+    `finished` is set.
+    """
+
+    caption = "Virtual BMO"
+    size = (480, 320)
+    fps = 30
+
+    def __init__(self):
+        self.finished = False
+
+    def reset(self):
+        self.finished = False
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT or event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.finished = True
+
+    def update(self):
+        pass
+
+    def draw(self, surface):
+        pass
+
+
+def run_standalone(scene):
+    """Run a scene in its own window at its native size (for playing a game outside BMO)."""
+    pygame.init()
+    screen = pygame.display.set_mode(scene.size)
+    pygame.display.set_caption(scene.caption)
+    clock = pygame.time.Clock()
+    scene.reset()
+    while not scene.finished:
+        for event in pygame.event.get():
+            scene.handle_event(event)
+        scene.update()
+        if scene.finished:
+            break
+        scene.draw(screen)
+        pygame.display.flip()
+        clock.tick(scene.fps)
@@ -0,0 +1,158 @@
+"""
+Snake rules without a display.
+
+SnakeGame is a single seedable game with a step() API; the body is a deque
+plus a set of occupied cells, so moving and collision checks are O(1).
+BatchSnake steps thousands of games at once with NumPy for bots, replay
+checks and tests. Coordinates are grid cells; the pygame front-end
+multiplies by CELL.
+"""
+import random
+from collections import deque
+import numpy as np
+
+CELL = 20
+COLS = 480 // CELL
+ROWS = 320 // CELL
+
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+START = (5, 2)
+START_FOOD = (10, 7)
+
+
+class SnakeGame:
+    def __init__(self, seed=None, cols=COLS, rows=ROWS):
+        self.cols = cols
+        self.rows = rows
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        self.body = deque([START])
+        self.occupied = {START}
+        self.direction = RIGHT
+        self.food = START_FOOD
+        self.score = 0
+        self.steps = 0
+        self.done = False
+
+    def _place_food(self):
+        if len(self.occupied) >= self.cols * self.rows:
+            return None
+        while True:
+            cell = (self.rng.randrange(self.cols), self.rng.randrange(self.rows))
+            if cell not in self.occupied:
+                return cell
+
+    def step(self, action=None):
+        """Advance one tick, optionally turning first. Returns (reward, done)."""
+        if self.done:
+            return 0, True
+        if action is not None:
+            self.direction = action
+        dx, dy = DIRECTIONS[self.direction]
+        head = self.body[0]
+        new_head = (head[0] + dx, head[1] + dy)
+        self.steps += 1
+
+        if new_head in self.occupied or not (0 <= new_head[0] < self.cols and 0 <= new_head[1] < self.rows):
+            self.done = True
+            return -1, True
+
+        self.body.appendleft(new_head)
+        self.occupied.add(new_head)
+        if new_head == self.food:
+            self.score += 1
+            self.food = self._place_food()
+            if self.food is None:   # board full
+                self.done = True
+            return 1, self.done
+        self.occupied.discard(self.body.pop())
+        return 0, False
+
+    def observation(self):
+        return {"body": list(self.body), "food": self.food, "direction": self.direction, "score": self.score}
+
+
+class BatchSnake:
+    """
+    n independent games stepped together. Each body is a ring buffer of cell
+    indices with an occupancy grid, so a step is a handful of array ops
+    regardless of snake length. Finished games stay frozen until reset().
+    """
+
+    def __init__(self, n, seed=None, cols=COLS, rows=ROWS):
+        self.n = n
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.rng = np.random.default_rng(seed)
+        self._delta = np.array([-cols, cols, -1, 1])
+        self._dx = np.array([d[0] for d in DIRECTIONS])
+        self._dy = np.array([d[1] for d in DIRECTIONS])
+        self.body = np.zeros((n, self.cells), dtype=np.int32)
+        self.occupied = np.zeros((n, self.cells), dtype=bool)
+        self.head = np.zeros(n, dtype=np.int64)     # ring position of the head
+        self.length = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        idx = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        start = START[1] * self.cols + START[0]
+        self.occupied[idx] = False
+        self.occupied[idx, start] = True
+        self.body[idx, 0] = start
+        self.head[idx] = 0
+        self.length[idx] = 1
+        self.food[idx] = START_FOOD[1] * self.cols + START_FOOD[0]
+        self.direction[idx] = RIGHT
+        self.score[idx] = 0
+        self.done[idx] = False
+
+    def step(self, actions=None):
+        """actions: int array of directions (or None to keep going). Returns (rewards, done)."""
+        if actions is not None:
+            self.direction = np.asarray(actions, dtype=np.int64)
+        alive = np.flatnonzero(~self.done)
+        rewards = np.zeros(self.n, dtype=np.int64)
+        if alive.size == 0:
+            return rewards, self.done
+
+        direction = self.direction[alive]
+        old = self.body[alive, self.head[alive]]
+        x = old % self.cols + self._dx[direction]
+        y = old // self.cols + self._dy[direction]
+        inside = (x >= 0) & (x < self.cols) & (y >= 0) & (y < self.rows)
+        new = np.where(inside, y * self.cols + x, 0)
+        crashed = ~inside | self.occupied[alive, new]
+        self.done[alive[crashed]] = True
+        rewards[alive[crashed]] = -1
+
+        moving = alive[~crashed]
+        new = new[~crashed]
+        self.head[moving] = (self.head[moving] + 1) % self.cells
+        self.body[moving, self.head[moving]] = new
+        self.occupied[moving, new] = True
+
+        ate = new == self.food[moving]
+        growers = moving[ate]
+        movers = moving[~ate]
+        tail = self.body[movers, (self.head[movers] - self.length[movers]) % self.cells]
+        self.occupied[movers, tail] = False
+
+        self.length[growers] += 1
+        self.score[growers] += 1
+        rewards[growers] = 1
+        if growers.size:
+            # Uniform pick among free cells: the argmax of random noise on free cells
+            noise = self.rng.random((growers.size, self.cells))
+            noise[self.occupied[growers]] = -1.0
+            self.food[growers] = noise.argmax(axis=1)
+            self.done[growers[self.length[growers] >= self.cells]] = True
+        return rewards, self.done
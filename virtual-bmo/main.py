@@ -1,54 +1,173 @@
-import pygame
-import sys
-import os
-import queue
-import sounddevice as sd
-import vosk
-import pyttsx3
-import json
-import threading
-from datetime import datetime, timedelta
-#from alarm_clock import set_alarm, start_timer, start_stopwatch
 import time
+from startup import StartupProfile, Subsystems
+
+# Heavy modules (vosk, sounddevice, pyttsx3, numpy, Spotify) are imported by
+# the background loaders further down, so the face is up before any of them load
+profile = StartupProfile()
+
+with profile.phase("imports"):
+    import pygame
+    import sys
+    import os
+    import queue
+    import json
+    import threading
+    from datetime import datetime
+    from alarm_clock import Scheduler, schedule_kind
+    from voice_ai.tts_worker import TTSWorker, PRIORITY_ALARM, PRIORITY_CHAT
+    from voice_ai.intents import IntentEngine
+    from voice_ai.command_phrases import COMMAND_INTENTS
+    from face_renderer import AssetCache, TextCache, FaceRenderer, load_faces
 
 # === Init Pygame ===
-pygame.init()
-screen = pygame.display.set_mode((480, 320))
-pygame.display.set_caption("Virtual BMO")
-font = pygame.font.SysFont("Arial", 20)
-
-# === Load BMO image ===
-ASSET_PATH = os.path.join("assets", "bmo1.jpg")
-try:
-    bmo_image = pygame.image.load(ASSET_PATH)
-    bmo_image = pygame.transform.scale(bmo_image, (480, 320))
-except pygame.error as e:
-    print(f"Error loading image: {e}")
-    sys.exit(1)
+with profile.phase("display"):
+    pygame.init()
+    screen = pygame.display.set_mode((480, 320))
+    pygame.display.set_caption("Virtual BMO")
+    font = pygame.font.SysFont("Arial", 20)
+
+# === Load BMO faces ===
+# Every image is scaled and convert()ed once; mood variants (assets/bmo_<state>.png) are optional
+with profile.phase("faces"):
+    assets = AssetCache()
+    try:
+        faces = load_faces(assets, "assets", (480, 320))
+    except (pygame.error, OSError) as e:
+        print(f"Error loading image: {e}")
+        sys.exit(1)
+
+# Show the face straight away; everything else loads in the background
+ACTIVE_FPS = 30
+IDLE_FPS = 10
+WAKING_TEXT = "BMO is waking up..."
+READY_TEXT = "Press SPACE to talk to BMO"
+
+renderer = FaceRenderer(screen, faces, TextCache(font), active_fps=ACTIVE_FPS, idle_fps=IDLE_FPS)
+renderer.set_text("text", WAKING_TEXT, (10, 280))
+renderer.draw()
+profile.mark("first frame")
+subsystems = Subsystems(profile)
 
 # === TTS setup ===
-engine = pyttsx3.init()
-def speak(text):
-    print(f"BMO: {text}")
-    engine.say(text)
+# The pyttsx3 engine lives on the TTS worker thread; everything else queues
+# utterances through speak(). load_tts() fills these in.
+tts_cache = None
+tts = None
+
+# Phrases BMO says all the time get synthesized once and replayed from the cache
+PREWARM_PHRASES = [
+    "Hello friend! I am BMO!",
+    "I'm not sure what you said.",
+    "Goodbye! Shutting down.",
+    "Launching game mode!",
+    "Hope you enjoyed the game!",
+    "Scan this code to connect Spotify.",
+    "Now playing music!",
+    "Timer is running.",
+    "Stopwatch started.",
+    "Alarm process started.",
+    "What time should I set the alarm for? Please say it in HH:MM format.",
+    "How many seconds should I set the timer for?",
+    "Starting stopwatch. Say stop the stop watch to end it.",
+    "You have nothing set right now.",
+    "⏰ Time's up!",
+]
+
+def synthesize(engine, text):
+    """Render text to audio with pyttsx3, returning (samples, sample_rate)"""
+    tmp_path = os.path.join(tts_cache.cache_dir, "synth.tmp.wav")
+    engine.save_to_file(text, tmp_path)
     engine.runAndWait()
+    try:
+        with wave.open(tmp_path, "rb") as wav:
+            audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+            return audio.reshape(-1, wav.getnchannels()), wav.getframerate()
+    except (OSError, wave.Error):
+        # Some pyttsx3 drivers don't write WAV files; speak directly instead
+        return None
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def play_utterance(engine, text, interruptible, stop):
+    """
+    Play one utterance on the TTS worker. Returns early when `stop` is set
+    (preempted by an alarm). With interruptible=True the microphone is
+    watched too; if the user starts speaking, playback stops right away and
+    the sample position where they started is returned.
+    """
+    voice, rate = engine.getProperty('voice'), engine.getProperty('rate')
+    result = tts_cache.get_or_synthesize(text, voice, rate, lambda t: synthesize(engine, t))
+    if result is None:
+        engine.say(text)
+        engine.runAndWait()
+        return None
+    audio, sample_rate = result
+    sd.play(audio, sample_rate)
+
+    done = threading.Event()
+    onset = []
+    if interruptible and subsystems.ready("stt"):
+        def watch():
+            pos = capture.wait_for_onset(stop_event=done)
+            if pos is not None:
+                onset.append(pos)
+        threading.Thread(target=watch, daemon=True).start()
+
+    stream = sd.get_stream()
+    while stream.active and not onset and not stop.is_set():
+        time.sleep(0.02)
+    done.set()
+    if onset or stop.is_set():
+        sd.stop()
+    if onset:
+        print("✋ Barge-in: BMO stops talking")
+        return onset[0]
+    return None
+
+def prewarm(engine):
+    voice, rate = engine.getProperty('voice'), engine.getProperty('rate')
+    tts_cache.prewarm(PREWARM_PHRASES, voice, rate, lambda t: synthesize(engine, t))
+
+def load_tts():
+    global wave, np, sd, tts_cache, tts
+    import wave
+    import numpy as np
+    import sounddevice as sd
+    import pyttsx3
+    from voice_ai.audio_cache import AudioCache
+
+    tts_cache = AudioCache()
+    tts = TTSWorker(pyttsx3.init, play_utterance, prepare=prewarm)
+    tts.start()
+    return tts
+
+def speak(text, interruptible=False, priority=PRIORITY_CHAT):
+    """
+    Say text and wait until it has been spoken. Alarms use PRIORITY_ALARM
+    and cut off normal chatter. Returns the barge-in position, if any.
+    """
+    print(f"BMO: {text}")
+    try:
+        worker = subsystems.get("tts")
+    except RuntimeError:
+        return None
+    return worker.say(text, priority=priority, interruptible=interruptible)
+
+# === Alarms, timers and stopwatches ===
+def on_schedule_fired(schedule):
+    speak(schedule.message, priority=PRIORITY_ALARM)
+
+scheduler = Scheduler(on_schedule_fired)
+scheduler.start()
 
 def set_alarm():
     speak("What time should I set the alarm for? Please say it in HH:MM format.")
     time_str = listen()
     try:
         alarm_time = datetime.strptime(time_str, "%H:%M").time()
+        scheduler.add_alarm(alarm_time)
         speak(f"Alarm set for {alarm_time.strftime('%I:%M %p')}.")
-
-        def wait_for_alarm():
-            while True:
-                now = datetime.now().time()
-                if now.hour == alarm_time.hour and now.minute == alarm_time.minute:
-                    speak("⏰ Wake up! This is your alarm!")
-                    break
-                time.sleep(10)
-
-        threading.Thread(target=wait_for_alarm, daemon=True).start()
     except ValueError:
         speak("Sorry, I couldn't understand the time format.")
 
@@ -57,129 +176,344 @@ def start_timer():
     seconds_str = listen()
     try:
         seconds = int(seconds_str)
+        scheduler.add_timer(seconds)
         speak(f"Timer started for {seconds} seconds.")
-
-        def countdown():
-            time.sleep(seconds)
-            speak("⏰ Time's up!")
-
-        threading.Thread(target=countdown, daemon=True).start()
     except ValueError:
         speak("That wasn't a valid number of seconds.")
 
 def start_stopwatch():
-    speak("Starting stopwatch. Say stop to end it.")
-    start = time.time()
+    scheduler.start_stopwatch()
+    speak("Starting stopwatch. Say stop the stop watch to end it.")
 
-    def stopwatch_loop():
-        while True:
-            command = listen()
-            if "stop" in command:
-                elapsed = time.time() - start
-                speak(f"Stopwatch stopped. Elapsed time: {int(elapsed)} seconds.")
-                break
+def stop_stopwatch():
+    elapsed = scheduler.stop_stopwatch()
+    if elapsed is None:
+        return "No stopwatch is running."
+    return f"Stopwatch stopped. Elapsed time: {int(elapsed)} seconds."
 
-    threading.Thread(target=stopwatch_loop, daemon=True).start()
+def list_schedules(command):
+    schedules = scheduler.list(schedule_kind(command))
+    if not schedules:
+        return "You have nothing set right now."
+    return "You have " + ", ".join(s.describe() for s in schedules) + "."
+
+def cancel_schedules(command):
+    kind = schedule_kind(command)
+    removed = scheduler.cancel(kind)
+    if not removed:
+        return "There was nothing to cancel."
+    noun = kind or "schedule"
+    return f"Cancelled {len(removed)} {noun}{'' if len(removed) == 1 else 's'}."
 
 # === STT setup ===
 model_path = os.path.join("voice_ai", "model")
-if not os.path.exists(model_path):
-    print("❌ Vosk model not found in voice_ai/model/")
-    sys.exit(1)
-
-model = vosk.Model(model_path)
-q = queue.Queue()
-
-def callback(indata, frames, time, status):
-    if status:
-        print(status)
-    q.put(bytes(indata))
-
-def listen():
-    with sd.RawInputStream(samplerate=16000, blocksize=8000, dtype='int16',
-                           channels=1, callback=callback):
-        print("🎤 Listening...")
+model = None
+capture = None
+
+def load_stt():
+    global vosk, model, capture
+    if not os.path.exists(model_path):
+        raise FileNotFoundError("Vosk model not found in voice_ai/model/")
+    import vosk
+    from voice_ai.audio_capture import AudioCapture
+
+    model = vosk.Model(model_path)
+    # The microphone stays open; each listen() only decodes voiced audio from the moment it's called
+    capture = AudioCapture(samplerate=16000)
+    capture.start()
+    return model
+
+GRAMMAR_MIN_CONFIDENCE = 0.6
+
+def decode(rec, chunks):
+    """Feed audio chunks to a recognizer and return all result dicts"""
+    results = []
+    for chunk in chunks:
+        if rec.AcceptWaveform(chunk):
+            results.append(json.loads(rec.Result()))
+    results.append(json.loads(rec.FinalResult()))
+    return results
+
+def results_text(results):
+    return " ".join(r["text"] for r in results if r.get("text")).lower()
+
+def listen(start_pos=None, grammar=None):
+    """
+    Recognize the next utterance. With a grammar, decode against just those
+    phrases and only fall back to open dictation when the match is unknown
+    or low confidence.
+    """
+    subsystems.get("stt")
+    print("🎤 Listening...")
+    if grammar is None:
         rec = vosk.KaldiRecognizer(model, 16000)
-        while True:
-            data = q.get()
-            if rec.AcceptWaveform(data):
-                result = json.loads(rec.Result())
-                return result.get("text", "").lower()
+        return results_text(decode(rec, capture.utterance(start_pos=start_pos)))
+
+    rec = vosk.KaldiRecognizer(model, 16000, grammar)
+    rec.SetWords(True)
+    chunks = []
+    def keep(utterance):
+        for chunk in utterance:
+            chunks.append(chunk)
+            yield chunk
+    results = decode(rec, keep(capture.utterance(start_pos=start_pos)))
+
+    text = results_text(results)
+    words = [w for r in results for w in r.get("result", [])]
+    if words and "[unk]" not in text and min(w["conf"] for w in words) >= GRAMMAR_MIN_CONFIDENCE:
+        return text
+
+    print("🔁 Not a command, falling back to dictation")
+    return results_text(decode(vosk.KaldiRecognizer(model, 16000), chunks))
 
 # === Response Logic ===
-def respond(command):
-    if "music" in command:
-        from music_control.spotify_auth import get_token
+commands = IntentEngine()
+
+@commands.intent("music", COMMAND_INTENTS["music"])
+def play_music_command(command):
+    try:
+        spotify_auth, playback = subsystems.get("spotify", timeout=10)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return "Music isn't available right now."
+    if not spotify_auth.is_authorized():
         speak("Scan this code to connect Spotify.")
+        # Show the login QR until the callback arrives or the login times out
+        qr_path = spotify_auth.start_login()
+        show_overlay(qr_path, (140, 60), None, size=(200, 200))
+        try:
+            spotify_auth.wait_for_token()
+        except TimeoutError as e:
+            print(f"❌ {e}")
+            return "I couldn't connect to Spotify."
+        finally:
+            hide_overlay()
 
-        # Generate QR and wait for auth
-        get_token()
-
-        # Load QR code image and display it
-        qr_path = os.path.join("assets", "spotify_qr.png")
-        if os.path.exists(qr_path):
-            qr_image = pygame.image.load(qr_path)
-            qr_image = pygame.transform.scale(qr_image, (200, 200))
-            screen.blit(qr_image, (140, 60))  # center the QR
-            pygame.display.flip()
-            pygame.time.delay(5000)  # show QR for 5 seconds
-        else:
-            print("❌ QR code not found")
-
-        from music_control.playback import play_music
-        play_music()
-        return "Now playing music!"
-    elif "game" in command:
-        from games.snake_game import run_snake_game
-        speak("Launching game mode!")
-        run_snake_game()  # Snake game runs, then returns
-        return "Hope you enjoyed the game!"
-    elif "hello" in command:
-        return "Hello friend! I am BMO!"
-    elif "alarm" in command:
-        set_alarm()
-        return "Alarm process started."
-    elif "timer" in command:
-        start_timer()
-        return "Timer is running."
-    elif "stop watch" in command:
-        start_stopwatch()
-        return "Stopwatch started."
-    elif "bye" in command:
-        return "Goodbye! Shutting down."
-    else:
+    playback.play_music()
+    return "Now playing music!"
+
+@commands.intent("game", COMMAND_INTENTS["game"])
+def game_command(command):
+    hub = subsystems.get("games", timeout=10)
+    speak("Launching game mode!")
+    play_game(hub.choose(command))  # the game runs, then returns
+    return "Hope you enjoyed the game!"
+
+@commands.intent("hello", COMMAND_INTENTS["hello"])
+def hello_command(command):
+    return "Hello friend! I am BMO!"
+
+@commands.intent("cancel", COMMAND_INTENTS["cancel"])
+def cancel_command(command):
+    return cancel_schedules(command)
+
+@commands.intent("list", COMMAND_INTENTS["list"])
+def list_command(command):
+    return list_schedules(command)
+
+@commands.intent("alarm", COMMAND_INTENTS["alarm"])
+def alarm_command(command):
+    set_alarm()
+    return "Alarm process started."
+
+@commands.intent("timer", COMMAND_INTENTS["timer"])
+def timer_command(command):
+    start_timer()
+    return "Timer is running."
+
+@commands.intent("stopwatch", COMMAND_INTENTS["stopwatch"])
+def stopwatch_command(command):
+    start_stopwatch()
+    return "Stopwatch started."
+
+@commands.intent("stop_stopwatch", COMMAND_INTENTS["stop_stopwatch"])
+def stop_stopwatch_command(command):
+    return stop_stopwatch()
+
+@commands.intent("bye", COMMAND_INTENTS["bye"])
+def bye_command(command):
+    return "Goodbye! Shutting down."
+
+def respond(command):
+    # The most specific trigger phrase wins, so "cancel the alarm" never sets one
+    match, response = commands.handle(command)
+    if match is None:
         return "I'm not sure what you said."
+    return response
+
+# Phrases respond() understands. In command mode Kaldi only searches this
+# small grammar instead of the full vocabulary, which is faster and more accurate.
+COMMAND_PHRASES = commands.phrases()
+COMMAND_GRAMMAR = json.dumps(COMMAND_PHRASES + ["[unk]"])
+
+# === Background voice worker ===
+# Listening, recognition, responding and speaking all block for seconds, so
+# they run on a worker thread. The render loop only drains ui_events.
+ui_events = queue.Queue()
+voice_requests = queue.Queue()
+
+def post_ui(kind, *args):
+    ui_events.put((kind, args))
+
+def play_game(name):
+    """Push a game scene on the pygame thread and wait until the player leaves it"""
+    done = threading.Event()
+    post_ui("game", name, done)
+    done.wait()
+
+def show_overlay(path, position, seconds, size=None):
+    """
+    Show an image file over the face; it is loaded (once) on the pygame thread.
+    With seconds=None it stays up until hide_overlay().
+    """
+    post_ui("overlay", path, position, seconds, size)
+
+def hide_overlay():
+    post_ui("hide_overlay")
+
+def voice_interaction():
+    barge_in = None
+    while True:
+        post_ui("state", "listening")
+        command = listen(start_pos=barge_in, grammar=COMMAND_GRAMMAR)
+        print("You said:", command)
+        post_ui("state", "thinking")
+        response = respond(command)
+        post_ui("text", "BMO: " + response)
+        post_ui("state", "speaking")
+        # If the user talks over BMO, handle what they said straight away
+        barge_in = speak(response, interruptible=True)
+        if barge_in is None:
+            return response
+
+def voice_worker():
+    while True:
+        voice_requests.get()
+        try:
+            response = voice_interaction()
+            if "goodbye" in response.lower():
+                post_ui("quit")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            post_ui("text", f"BMO: {e}")
+        post_ui("state", "idle")
+
+threading.Thread(target=voice_worker, daemon=True).start()
+
+# === Background loading ===
+def load_games():
+    from game_hub import GameHub
+    return GameHub(screen)
+
+def load_spotify():
+    from music_control import spotify_auth, playback
+    return spotify_auth, playback
+
+def announce_ready():
+    """Tell the user once voice works, and print the startup profile when everything has loaded"""
+    try:
+        subsystems.get("stt")
+        subsystems.get("tts")
+        post_ui("text", READY_TEXT)
+    except RuntimeError as e:
+        post_ui("text", f"Voice unavailable: {e}")
+    subsystems.wait_all()
+    profile.mark("all loaded")
+    profile.report()
+
+subsystems.load("stt", load_stt)
+subsystems.load("tts", load_tts)
+subsystems.load("games", load_games)
+subsystems.load("spotify", load_spotify)
+threading.Thread(target=announce_ready, daemon=True).start()
 
 # === Main Pygame loop ===
-current_text = "Press SPACE to talk to BMO"
+STATE_LABELS = {"listening": "Listening", "thinking": "Thinking", "speaking": "Speaking"}
+
+game_hub = None
+game_done = None
+current_text = WAKING_TEXT
+state = "idle"
+overlay_until = None
 running = True
 
 while running:
-    screen.blit(bmo_image, (0, 0))
+    # Apply updates from the voice worker
+    while True:
+        try:
+            kind, args = ui_events.get_nowait()
+        except queue.Empty:
+            break
+        if kind == "state":
+            state = args[0]
+        elif kind == "text":
+            current_text = args[0]
+        elif kind == "overlay":
+            path, position, seconds, size = args
+            try:
+                renderer.set_layer("overlay", assets.get(path, size), position)
+                overlay_until = None if seconds is None else pygame.time.get_ticks() + seconds * 1000
+            except (pygame.error, OSError) as e:
+                print(f"❌ Could not show {path}: {e}")
+        elif kind == "hide_overlay":
+            renderer.set_layer("overlay", None)
+            overlay_until = None
+        elif kind == "game":
+            name, game_done = args
+            game_hub = subsystems.get("games")
+            game_hub.push(name)
+        elif kind == "quit":
+            running = False
 
-    # Render the last voice result
-    text_surface = font.render(current_text, True, (0, 0, 0))
-    screen.blit(text_surface, (10, 280))
+    events = pygame.event.get()
 
-    for event in pygame.event.get():
+    # While a game is on top, it gets the events, display and clock
+    if game_hub is not None and game_hub.active is not None:
+        if not game_hub.frame(events):
+            returned = time.perf_counter()
+            pygame.display.set_caption("Virtual BMO")
+            renderer.invalidate()
+            renderer.draw()
+            print(f"🎮 Back to BMO in {(time.perf_counter() - returned) * 1000:.1f} ms")
+            game_done.set()
+        else:
+            renderer.clock.tick(game_hub.active.fps)
+        continue
+
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
+        elif event.type == pygame.WINDOWEXPOSED:
+            renderer.invalidate()
 
         # Press SPACE to trigger voice interaction
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-            current_text = "Listening..."
-            pygame.display.flip()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and state == "idle":
+            state = "listening"
+            voice_requests.put(True)
 
-            command = listen()
-            print("You said:", command)
-            response = respond(command)
-            speak(response)
-            current_text = "BMO: " + response
+    if overlay_until is not None and pygame.time.get_ticks() >= overlay_until:
+        renderer.set_layer("overlay", None)
+        overlay_until = None
 
-            if "goodbye" in response.lower():
-                running = False
+    # Last voice result, plus the live state while the worker is busy
+    renderer.set_mood(state)
+    renderer.set_text("text", current_text, (10, 280))
+    if state != "idle":
+        dots = "." * (pygame.time.get_ticks() // 400 % 4)
+        renderer.set_text("state", STATE_LABELS[state] + dots, (10, 10))
+    else:
+        renderer.set_text("state", None, (10, 10))
 
-    pygame.display.flip()
+    # Only changed rectangles are repainted; idle frames usually draw nothing
+    renderer.draw()
+    renderer.tick(active=state != "idle")
 
+print(f"📊 Render: {renderer.stats()}")
+if subsystems.ready("tts"):
+    print(f"📊 TTS: {tts.stats()}")
+    tts.close()
+scheduler.stop()
+if subsystems.ready("stt"):
+    capture.close()
 pygame.quit()
 sys.exit()
\ No newline at end of file
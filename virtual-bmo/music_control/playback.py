@@ -1,27 +1,137 @@
+import os
+import threading
+import time
+from collections import deque
 import spotipy
-from spotipy.oauth2 import SpotifyOAuth
 from music_control.spotify_auth import get_token
 
+# Point at a local fake of the Web API (e.g. http://127.0.0.1:9001/v1/) for testing
+api_url = os.getenv('SPOTIFY_API_URL')
+DEVICE_TTL = 30     # seconds a devices() answer is trusted
+
+class _TokenProvider:
+    """spotipy auth manager backed by spotify_auth's cached, auto-refreshed token."""
+
+    def get_access_token(self, as_dict=False):
+        return get_token()
+
+_client = None
+_client_lock = threading.Lock()
+
 def get_spotify_client():
-    token = get_token()
-    return spotipy.Spotify(auth=token)
+    """One client (and one pooled HTTPS session) for the life of the process."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = spotipy.Spotify(auth_manager=_TokenProvider())
+            if api_url:
+                _client.prefix = api_url
+        return _client
+
+class Player:
+    """
+    Runs playback commands on a background thread so voice handling and the
+    pygame loop never wait on Spotify. Commands that are still queued are
+    collapsed: a new play/pause replaces a pending one (last state wins) and
+    repeated "next" presses merge into a single skip.
+    """
+
+    STATE_COMMANDS = ("play", "pause")
+
+    def __init__(self):
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._devices = None
+        self._devices_at = 0.0
+        self.sent = 0
+        self.collapsed = 0
+        self.device_cache_hits = 0
+        self.thread = threading.Thread(target=self._run, name="bmo-spotify", daemon=True)
+        self.thread.start()
+
+    def submit(self, command):
+        with self._cond:
+            if command in self.STATE_COMMANDS:
+                redundant = [c for c in self._pending if c in self.STATE_COMMANDS]
+            else:
+                redundant = [c for c in self._pending if c == command]
+            for queued in redundant:
+                self._pending.remove(queued)
+                self.collapsed += 1
+            self._pending.append(command)
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                command = self._pending.popleft()
+            try:
+                getattr(self, "_" + command)(get_spotify_client())
+                self.sent += 1
+            except Exception as e:
+                print(f"❌ Spotify {command} failed: {e}")
+
+    def _device_id(self, sp, refresh=False):
+        now = time.monotonic()
+        if refresh or self._devices is None or now - self._devices_at > DEVICE_TTL:
+            self._devices = sp.devices()["devices"]
+            self._devices_at = now
+        else:
+            self.device_cache_hits += 1
+        if not self._devices:
+            return None
+        active = [d for d in self._devices if d.get("is_active")]
+        return (active or self._devices)[0]["id"]
+
+    def _play(self, sp):
+        device_id = self._device_id(sp)
+        if device_id is None:
+            print("❌ No active Spotify devices found.")
+            return
+        try:
+            sp.start_playback(device_id=device_id)
+        except spotipy.SpotifyException as e:
+            if e.http_status != 404:
+                raise
+            # The cached device went away; look again once
+            device_id = self._device_id(sp, refresh=True)
+            if device_id is None:
+                print("❌ No active Spotify devices found.")
+                return
+            sp.start_playback(device_id=device_id)
+        print("▶️ BMO started playing music.")
+
+    def _pause(self, sp):
+        sp.pause_playback()
+        print("⏸️ Music paused.")
+
+    def _next(self, sp):
+        sp.next_track()
+        print("⏭️ Skipped to next track.")
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "collapsed": self.collapsed,
+            "device_cache_hits": self.device_cache_hits,
+            "pending": len(self._pending),
+        }
+
+_player = None
+
+def get_player():
+    global _player
+    if _player is None:
+        _player = Player()
+    return _player
 
 def play_music():
-    sp = get_spotify_client()
-    devices = sp.devices()["devices"]
-    if not devices:
-        print("❌ No active Spotify devices found.")
-        return
-    device_id = devices[0]["id"]
-    sp.start_playback(device_id=device_id)
-    print("▶️ BMO started playing music.")
+    get_player().submit("play")
 
 def pause_music():
-    sp = get_spotify_client()
-    sp.pause_playback()
-    print("⏸️ Music paused.")
+    get_player().submit("pause")
 
 def next_track():
-    sp = get_spotify_client()
-    sp.next_track()
-    print("⏭️ Skipped to next track.")
\ No newline at end of file
+    get_player().submit("next")
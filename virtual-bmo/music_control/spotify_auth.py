@@ -1,9 +1,12 @@
 import os
+import time
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 import qrcode
 import webbrowser
 import threading
 from flask import Flask, request
+from spotipy.cache_handler import CacheFileHandler
 from spotipy.oauth2 import SpotifyOAuth
 
 load_dotenv()  # loads the .env file
@@ -11,51 +14,131 @@ load_dotenv()  # loads the .env file
 client_id = os.getenv('SPOTIPY_CLIENT_ID')
 client_secret = os.getenv('SPOTIPY_CLIENT_SECRET')
 redirect_uri = os.getenv('SPOTIPY_REDIRECT_URI')
+# Point at a local stand-in OAuth server (e.g. http://127.0.0.1:9000) for testing
+accounts_url = os.getenv('SPOTIFY_ACCOUNTS_URL')
 
-auth_token = None
+SCOPE = "user-read-playback-state user-modify-playback-state"
+TOKEN_CACHE = os.path.join("cache", "spotify_token.json")
+QR_PATH = os.path.join("assets", "spotify_qr.png")
+LOGIN_TIMEOUT = 180     # seconds to wait for the QR code to be scanned
+REFRESH_MARGIN = 300    # refresh this long before the token expires
+RETRY_DELAY = 60
+
+_oauth = None
+_token_info = None
+_token_ready = threading.Event()
+_lock = threading.Lock()
+_server_thread = None
+_refresh_timer = None
 app = Flask(__name__)
 
-def start_server():
-    app.run(port=8888)
+def get_oauth():
+    global _oauth
+    if _oauth is None:
+        os.makedirs(os.path.dirname(TOKEN_CACHE), exist_ok=True)
+        _oauth = SpotifyOAuth(
+            client_id=client_id,
+            client_secret=client_secret,
+            redirect_uri=redirect_uri,
+            scope=SCOPE,
+            open_browser=False,
+            cache_handler=CacheFileHandler(cache_path=TOKEN_CACHE),
+        )
+        if accounts_url:
+            _oauth.OAUTH_AUTHORIZE_URL = accounts_url.rstrip("/") + "/authorize"
+            _oauth.OAUTH_TOKEN_URL = accounts_url.rstrip("/") + "/api/token"
+    return _oauth
+
+def _set_token(token_info):
+    """Store a fresh token and schedule its refresh (caller holds _lock)."""
+    global _token_info, _refresh_timer
+    _token_info = token_info
+    if _refresh_timer is not None:
+        _refresh_timer.cancel()
+    delay = max(0, token_info["expires_at"] - time.time() - REFRESH_MARGIN)
+    _refresh_timer = threading.Timer(delay, _refresh)
+    _refresh_timer.daemon = True
+    _refresh_timer.start()
+    _token_ready.set()
+
+def _refresh():
+    global _refresh_timer
+    with _lock:
+        try:
+            _set_token(get_oauth().refresh_access_token(_token_info["refresh_token"]))
+            print("🔄 Spotify token refreshed")
+        except Exception as e:
+            print(f"❌ Spotify token refresh failed: {e}")
+            _refresh_timer = threading.Timer(RETRY_DELAY, _refresh)
+            _refresh_timer.daemon = True
+            _refresh_timer.start()
+
+def _load_token():
+    """Return a usable token from memory or the disk cache, refreshing it if it has expired."""
+    with _lock:
+        oauth = get_oauth()
+        # The in-memory token can be stale too, e.g. after failed refreshes or a suspend
+        token_info = _token_info or oauth.cache_handler.get_cached_token()
+        if not token_info:
+            return None
+        if not oauth.is_token_expired(token_info):
+            if token_info is not _token_info:
+                _set_token(token_info)
+            return token_info
+        try:
+            token_info = oauth.refresh_access_token(token_info["refresh_token"])
+        except Exception as e:
+            print(f"❌ Spotify token could not be refreshed: {e}")
+            return None
+        _set_token(token_info)
+        return token_info
+
+def is_authorized():
+    return _load_token() is not None
 
 @app.route("/callback")
 def callback():
-    global auth_token
     code = request.args.get("code")
-    sp_oauth = SpotifyOAuth(
-        client_id=client_id,
-        client_secret=client_secret,
-        redirect_uri=redirect_uri,
-        scope="user-read-playback-state,user-modify-playback-state"
-    )
-    token_info = sp_oauth.get_access_token(code)
-    auth_token = token_info["access_token"]
+    if not code:
+        return f"❌ Spotify login failed: {request.args.get('error', 'no code')}", 400
+    token_info = get_oauth().get_access_token(code, check_cache=False)
+    with _lock:
+        _set_token(token_info)
     return "✅ BMO connected to Spotify! You can close this tab."
 
-def get_token():
-    global auth_token
-    if auth_token:
-        return auth_token
+def _start_server():
+    global _server_thread
+    if _server_thread is None:
+        port = urlparse(redirect_uri or "").port or 8888
+        _server_thread = threading.Thread(
+            target=app.run, kwargs={"port": port, "use_reloader": False}, daemon=True
+        )
+        _server_thread.start()
 
-    sp_oauth = SpotifyOAuth(
-        client_id=client_id,
-        redirect_uri=redirect_uri,
-        scope="user-read-playback-state user-modify-playback-state",
-        open_browser=False,
-    )
-    auth_url = sp_oauth.get_authorize_url()
+def start_login():
+    """Write the login QR code (and open a browser) and start the callback server once."""
+    auth_url = get_oauth().get_authorize_url()
 
     img = qrcode.make(auth_url)
-    img.save("assets/spotify_qr.png")
-    print("📲 Scan QR from assets/spotify_qr.png to connect Spotify")
+    img.save(QR_PATH)
+    print(f"📲 Scan QR from {QR_PATH} to connect Spotify")
 
     # Also open in browser for convenience
     webbrowser.open(auth_url)
 
-    threading.Thread(target=start_server).start()
+    _start_server()
+    return QR_PATH
 
+def wait_for_token(timeout=LOGIN_TIMEOUT):
     print("🔃 Waiting for Spotify login...")
-    while not auth_token:
-        pass
+    if not _token_ready.wait(timeout):
+        raise TimeoutError(f"Spotify login not completed within {timeout} seconds")
+    return _token_info["access_token"]
 
-    return auth_token
\ No newline at end of file
+def get_token(timeout=LOGIN_TIMEOUT):
+    """Access token for the Web API. Only the first run ever needs the QR login."""
+    token_info = _load_token()
+    if token_info is not None:
+        return token_info["access_token"]
+    start_login()
+    return wait_for_token(timeout)
@@ -0,0 +1,83 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """Wall-clock timings of startup phases, including ones running on background threads."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append((name, start - self.origin, end - start, threading.current_thread().name))
+
+    def mark(self, name):
+        """Record a moment (e.g. the first frame) rather than a span."""
+        with self._lock:
+            self.phases.append((name, time.perf_counter() - self.origin, 0.0, threading.current_thread().name))
+
+    def report(self):
+        print("⏱️ Startup profile (ms since launch)")
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+        for name, start, duration, thread in phases:
+            span = f"+{duration * 1000:7.0f}" if duration else " " * 8
+            print(f"   {start * 1000:7.0f} {span}  {name:<16} [{thread}]")
+
+
+class Subsystems:
+    """
+    Loads heavy subsystems on background threads, in parallel, behind
+    readiness flags. Callers that need one wait for it with get(); a loader
+    that fails marks its subsystem unavailable instead of stopping BMO.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self._ready = {}
+        self._values = {}
+        self._errors = {}
+
+    def load(self, name, loader):
+        self._ready[name] = threading.Event()
+        threading.Thread(target=self._run, args=(name, loader), name=f"load-{name}", daemon=True).start()
+
+    def _run(self, name, loader):
+        try:
+            with self.profile.phase(name):
+                self._values[name] = loader()
+        except Exception as e:
+            self._errors[name] = e
+            print(f"❌ {name} unavailable: {e}")
+        finally:
+            self._ready[name].set()
+
+    def ready(self, name):
+        return self._ready[name].is_set() and name not in self._errors
+
+    def failed(self, name):
+        return self._ready[name].is_set() and name in self._errors
+
+    def get(self, name, timeout=None):
+        """Wait for a subsystem and return its loader's result; RuntimeError if it failed or timed out."""
+        if not self._ready[name].wait(timeout):
+            raise RuntimeError(f"{name} is still loading")
+        if name in self._errors:
+            raise RuntimeError(f"{name} unavailable: {self._errors[name]}")
+        return self._values[name]
+
+    def wait_all(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for event in self._ready.values():
+            event.wait(None if deadline is None else max(0, deadline - time.monotonic()))
+        return all(event.is_set() for event in self._ready.values())
@@ -0,0 +1,35 @@
+import pytest
+
+from alarm_clock import schedule_kind
+from voice_ai.command_phrases import COMMAND_INTENTS
+from voice_ai.intents import IntentEngine
+
+
+@pytest.fixture(scope="module")
+def commands():
+    engine = IntentEngine()
+    for name, phrases in COMMAND_INTENTS.items():
+        engine.register(name, phrases)
+    return engine
+
+
+@pytest.mark.parametrize("text", ["how many times", "tiger", "shake", "snakes", "hells bells", "lists"])
+def test_near_misses_trigger_nothing(commands, text):
+    assert commands.best(text) is None
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("set a timer", "timer"),
+    ("play snake", "game"),
+    ("hello bmo", "hello"),
+    ("list alarms", "list"),
+    ("stop the stop watch", "stop_stopwatch"),
+])
+def test_commands(commands, text, intent):
+    assert commands.best(text).intent == intent
+
+
+@pytest.mark.parametrize("text", ["cancel the stop watch", "cancel the stopwatch", "cancel stopwatch"])
+def test_cancel_stopwatch_cancels_only_stopwatches(commands, text):
+    assert commands.best(text).intent == "cancel"
+    assert schedule_kind(text) == "stopwatch"
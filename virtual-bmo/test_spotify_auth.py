@@ -0,0 +1,61 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from music_control import spotify_auth
+
+
+class StandInAccounts(BaseHTTPRequestHandler):
+    """Answers refresh requests the way accounts.spotify.com/api/token does"""
+    refreshes = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        StandInAccounts.refreshes.append(body)
+        token = {"access_token": "fresh", "token_type": "Bearer", "expires_in": 3600,
+                 "scope": spotify_auth.SCOPE}
+        data = json.dumps(token).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def accounts(tmp_path, monkeypatch):
+    server = HTTPServer(("127.0.0.1", 0), StandInAccounts)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StandInAccounts.refreshes = []
+    monkeypatch.setattr(spotify_auth, "accounts_url", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(spotify_auth, "client_id", "bmo-client")
+    monkeypatch.setattr(spotify_auth, "client_secret", "bmo-secret")
+    monkeypatch.setattr(spotify_auth, "redirect_uri", "http://127.0.0.1:8888/callback")
+    monkeypatch.setattr(spotify_auth, "TOKEN_CACHE", str(tmp_path / "spotify_token.json"))
+    monkeypatch.setattr(spotify_auth, "_oauth", None)
+    monkeypatch.setattr(spotify_auth, "_token_info", None)
+    yield server
+    if spotify_auth._refresh_timer is not None:
+        spotify_auth._refresh_timer.cancel()
+    server.shutdown()
+
+
+def test_expired_token_in_memory_is_refreshed(accounts, monkeypatch):
+    monkeypatch.setattr(spotify_auth, "_token_info", {
+        "access_token": "stale",
+        "refresh_token": "keep-me",
+        "expires_at": int(time.time()) - 10,
+        "scope": spotify_auth.SCOPE,
+    })
+    assert spotify_auth.get_token() == "fresh"
+    assert len(StandInAccounts.refreshes) == 1
+    assert "refresh_token=keep-me" in StandInAccounts.refreshes[0]
+    # The new token is kept, so the next call doesn't refresh again
+    assert spotify_auth.get_token() == "fresh"
+    assert len(StandInAccounts.refreshes) == 1
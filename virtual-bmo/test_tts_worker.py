@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+
+from voice_ai.tts_worker import TTSWorker
+
+
+def test_engine_failure_is_reported_to_start():
+    def broken_engine():
+        raise OSError("no audio driver")
+
+    worker = TTSWorker(broken_engine, play=lambda *args: None)
+    with pytest.raises(RuntimeError, match="no audio driver"):
+        worker.start(timeout=5)
+    # Nobody can block on a worker that never started
+    assert worker.say("hello", wait=True) is None
+
+
+def test_failed_prepare_still_speaks():
+    def prepare(engine):
+        raise RuntimeError("prewarm failed")
+
+    worker = TTSWorker(lambda: "engine", play=lambda engine, text, interruptible, stop: text, prepare=prepare)
+    worker.start(timeout=5)
+    assert worker.say("hello") == "hello"
+    worker.close()
+
+
+def test_queued_utterances_finish_when_the_worker_stops():
+    playing = threading.Event()
+    release = threading.Event()
+
+    def play(engine, text, interruptible, stop):
+        playing.set()
+        release.wait(5)
+
+    worker = TTSWorker(lambda: "engine", play)
+    worker.start(timeout=5)
+    first = worker.say("first", wait=False)
+    playing.wait(5)
+    queued = worker.say("second", wait=False)
+    worker.close()
+    release.set()
+    assert first.done.wait(5) and queued.done.wait(5)
+    assert queued.cancelled
+    assert worker.say("later", wait=False).done.is_set()
@@ -0,0 +1,17 @@
+# Trigger phrases for each voice command main.py understands. Kept apart
+# from the handlers so the phrase set can be checked without starting BMO.
+COMMAND_INTENTS = {
+    "music": ["play music", "music"],
+    "game": ["play a game", "game", "let's play a game", "play snake", "snake", "play flappy bird", "flappy bird"],
+    "hello": ["hello", "hello bmo", "hi bmo"],
+    "cancel": [
+        "cancel", "cancel alarm", "cancel the alarm", "cancel timer", "cancel the timer", "cancel all",
+        "cancel stopwatch", "cancel the stopwatch", "cancel stop watch", "cancel the stop watch",
+    ],
+    "list": ["list", "list alarms", "list timers", "what alarms", "what timers"],
+    "alarm": ["set an alarm", "alarm"],
+    "timer": ["set a timer", "timer"],
+    "stopwatch": ["stop watch", "start the stop watch"],
+    "stop_stopwatch": ["stop the stop watch", "stop the stopwatch"],
+    "bye": ["bye", "goodbye", "bye bmo"],
+}
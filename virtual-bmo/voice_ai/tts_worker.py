@@ -0,0 +1,197 @@
+import heapq
+import itertools
+import threading
+import time
+
+PRIORITY_ALARM = 0
+PRIORITY_CHAT = 1
+
+
+class Utterance:
+    def __init__(self, text, priority, interruptible):
+        self.text = text
+        self.priority = priority
+        self.interruptible = interruptible
+        self.enqueued_at = time.perf_counter()
+        self.started_at = None
+        self.stop = threading.Event()
+        self.done = threading.Event()
+        self.cancelled = False
+        self.preempted = False
+        self.result = None
+
+    def wait(self, timeout=None):
+        self.done.wait(timeout)
+        return self.result
+
+
+class TTSWorker:
+    """
+    One thread owns the TTS engine and speaks utterances from a priority
+    queue, so callers on any thread never overlap. A higher priority
+    utterance (e.g. an alarm) cuts off lower priority speech that is
+    playing, and identical utterances already waiting are merged.
+
+    create_engine() runs on the worker thread; play(engine, text,
+    interruptible, stop_event) must return early once stop_event is set.
+    start() waits for create_engine() and re-raises its error, and once the
+    worker has stopped every queued or later utterance is finished at once,
+    so callers never block on a dead thread.
+    """
+
+    def __init__(self, create_engine, play, prepare=None):
+        self.create_engine = create_engine
+        self.play = play
+        self.prepare = prepare
+        self._heap = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._current = None
+        self._closed = False
+        self._engine_ready = threading.Event()
+        self.error = None
+        self.waits = {}
+        self.spoken = 0
+        self.merged = 0
+        self.preemptions = 0
+        self.thread = threading.Thread(target=self._run, name="bmo-tts", daemon=True)
+
+    def start(self, timeout=None):
+        """Start the worker and wait for its engine; raises RuntimeError if the engine can't be created."""
+        self.thread.start()
+        if not self._engine_ready.wait(timeout):
+            raise RuntimeError("TTS engine is taking too long to start")
+        if self.error is not None:
+            raise RuntimeError(f"TTS engine failed to start: {self.error}") from self.error
+
+    def say(self, text, priority=PRIORITY_CHAT, interruptible=False, wait=True):
+        """Queue text to be spoken. Returns the play() result if wait=True, else the Utterance."""
+        with self._cond:
+            if self._closed:
+                utterance = Utterance(text, priority, interruptible)
+                utterance.cancelled = True
+                utterance.done.set()
+                return None if wait else utterance
+            utterance = self._find_queued(text, priority)
+            if utterance is not None:
+                self.merged += 1
+            else:
+                utterance = Utterance(text, priority, interruptible)
+                heapq.heappush(self._heap, (priority, next(self._counter), utterance))
+                current = self._current
+                if current is not None and priority < current.priority:
+                    current.preempted = True
+                    current.stop.set()
+                    self.preemptions += 1
+                self._cond.notify_all()
+        return utterance.wait() if wait else utterance
+
+    def _find_queued(self, text, priority):
+        for _, _, queued in self._heap:
+            if queued.text == text and queued.priority == priority and not queued.cancelled:
+                return queued
+        return None
+
+    def cancel(self, predicate=lambda utterance: True, include_current=False):
+        """Drop queued utterances matching predicate (and optionally stop the one playing)."""
+        with self._cond:
+            kept = []
+            cancelled = 0
+            for entry in self._heap:
+                if predicate(entry[2]):
+                    entry[2].cancelled = True
+                    entry[2].done.set()
+                    cancelled += 1
+                else:
+                    kept.append(entry)
+            heapq.heapify(kept)
+            self._heap = kept
+            if include_current and self._current is not None and predicate(self._current):
+                self._current.stop.set()
+                cancelled += 1
+        return cancelled
+
+    def _run(self):
+        try:
+            engine = self.create_engine()
+        except Exception as e:
+            print(f"❌ TTS engine failed to start: {e}")
+            self.error = e
+            self._shut_down()
+            return
+        finally:
+            self._engine_ready.set()
+
+        if self.prepare is not None:
+            try:
+                self.prepare(engine)
+            except Exception as e:
+                print(f"⚠️ TTS prepare failed, continuing without it: {e}")
+
+        try:
+            self._serve(engine)
+        except Exception as e:
+            print(f"❌ TTS worker stopped: {e}")
+            self.error = e
+        finally:
+            self._shut_down()
+
+    def _shut_down(self):
+        """Refuse new utterances and release everyone waiting on a queued one."""
+        with self._cond:
+            self._closed = True
+            for _, _, utterance in self._heap:
+                utterance.cancelled = True
+                utterance.done.set()
+            self._heap = []
+            if self._current is not None:
+                self._current.done.set()
+                self._current = None
+
+    def _serve(self, engine):
+        while True:
+            with self._cond:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                _, _, utterance = heapq.heappop(self._heap)
+                self._current = utterance
+
+            utterance.started_at = time.perf_counter()
+            waited = utterance.started_at - utterance.enqueued_at
+            self.waits.setdefault(utterance.priority, []).append(waited)
+            if waited > 0.25:
+                print(f"⏱️ TTS: '{utterance.text[:30]}' waited {waited * 1000:.0f} ms in queue")
+
+            try:
+                utterance.result = self.play(engine, utterance.text, utterance.interruptible, utterance.stop)
+            except Exception as e:
+                print(f"❌ TTS error: {e}")
+            finally:
+                with self._cond:
+                    self._current = None
+                self.spoken += 1
+                utterance.done.set()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            if self._current is not None:
+                self._current.stop.set()
+            self._cond.notify_all()
+
+    def stats(self):
+        by_priority = {}
+        for priority, waits in self.waits.items():
+            by_priority[priority] = {
+                "count": len(waits),
+                "avg_wait_ms": sum(waits) / len(waits) * 1000,
+                "max_wait_ms": max(waits) * 1000,
+            }
+        return {
+            "spoken": self.spoken,
+            "merged": self.merged,
+            "preemptions": self.preemptions,
+            "queue_wait": by_priority,
+        }